@@ -0,0 +1,83 @@
+"""
+Measures click latency on a large mesh with the default VTK pickers and with
+the cached cell locator picker used by Interactor.
+
+Usage: python benchmarks/picking.py [--triangles 2.0] [--clicks 50]
+"""
+# Standard Python modules
+# =======================
+import argparse
+import json
+import os
+import random
+import sys
+from time import perf_counter
+
+# External modules
+# ================
+from vtk import vtkPropPicker
+from vtk import vtkCellPicker
+
+# DICE modules
+# ============
+from dice_vtk import VtkScene
+from dice_vtk.picking import LocatorPicker
+from dice_vtk.geometries import VtkNumpySTL
+
+sys.path.insert(0, os.path.dirname(__file__))
+from render_bench import stl_data
+
+
+def measure(pick, points):
+    times = []
+    for x, y in points:
+        start = perf_counter()
+        pick(x, y)
+        times.append(perf_counter() - start)
+    first = times[0]
+    times.sort()
+    return dict(
+        first=first,
+        mean=sum(times) / len(times),
+        median=times[len(times) // 2],
+        max=times[-1]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--triangles', type=float, default=2.0,
+                        help='Millions of triangles of the mesh.')
+    parser.add_argument('--clicks', type=int, default=50)
+    parser.add_argument('--size', type=int, nargs=2, default=(1280, 720))
+    args = parser.parse_args()
+
+    scene = VtkScene(*args.size)
+    scene.add_object(VtkNumpySTL(stl_data(int(args.triangles * 1e6))))
+    scene.reset_camera()
+    scene.update_camera()
+    scene.render_window.Render()
+    renderer = scene.renderer
+
+    random.seed(0)
+    points = [(random.uniform(0, args.size[0]),
+               random.uniform(0, args.size[1]))
+              for i in range(args.clicks)]
+
+    prop_picker = vtkPropPicker()
+    cell_picker = vtkCellPicker()
+    locator_picker = LocatorPicker()
+    results = dict(
+        prop_picker=measure(
+            lambda x, y: prop_picker.Pick(x, y, 0.0, renderer), points),
+        cell_picker=measure(
+            lambda x, y: cell_picker.Pick(x, y, 0.0, renderer), points),
+        locator_picker=measure(
+            lambda x, y: locator_picker.pick(x, y, renderer), points)
+        )
+    scene.delete()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Renders synthetic scenes along a scripted camera orbit and reports frame
+rate, per-phase frame timings and peak memory usage as JSON.
+
+Every mode runs in a fresh process, so peak RSS of modes is comparable.
+Modes are 'default', 'lod' (LOD pyramids, built before measuring),
+'quadric' (quadric LOD actors), 'reduced' (interactive render scale, see
+--scale) and 'pbo' (pixel buffer readback).
+
+Runs headless with an offscreen capable VTK build (OSMesa or EGL), or under
+xvfb-run otherwise.
+
+Usage: python benchmarks/render_bench.py [--spheres 100] [--cubes 100]
+    [--stl-triangles 1.0] [--grid-cells 50] [--frames 200]
+    [--modes default lod quadric reduced pbo] [--output result.json]
+"""
+# Standard Python modules
+# =======================
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import resource
+from time import perf_counter
+
+# External modules
+# ================
+import numpy as np
+import vtk
+from vtk import vtkPoints
+from vtk import vtkUnstructuredGrid
+from vtk import vtkCellArray
+from vtk import VTK_HEXAHEDRON
+from vtk.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray
+
+# DICE modules
+# ============
+from dice_vtk import VtkScene
+from dice_vtk.readback import PixelBufferReadback
+from dice_vtk.geometries import Sphere, Cube, VtkNumpySTL
+from dice_vtk.geometries.simple_geometry import SimpleGeometry
+from dice_vtk.interactor import BasicInteractor
+
+
+MODES = ('default', 'lod', 'quadric', 'reduced', 'pbo')
+
+
+def stl_data(triangles):
+    """
+    Returns vertices of a triangulated torus with about the given number of
+    triangles as array of shape (triangles*3, 3).
+    """
+    n = max(2, int(math.sqrt(triangles / 2)))
+    u = np.linspace(0, 2 * np.pi, n + 1)
+    v = np.linspace(0, 2 * np.pi, n + 1)
+    u, v = np.meshgrid(u, v, indexing='ij')
+    grid = np.stack(((2 + np.cos(v)) * np.cos(u),
+                     (2 + np.cos(v)) * np.sin(u),
+                     np.sin(v)), axis=-1)
+    a = grid[:-1, :-1]
+    b = grid[1:, :-1]
+    c = grid[1:, 1:]
+    d = grid[:-1, 1:]
+    tris = np.concatenate((np.stack((a, b, c), axis=2),
+                           np.stack((a, c, d), axis=2)))
+    return np.ascontiguousarray(tris.reshape(-1, 3))
+
+
+def hex_grid(cells):
+    """
+    Returns vtkUnstructuredGrid of cells**3 hexahedra like a FOAM internal
+    mesh.
+    """
+    n = cells + 1
+    x, y, z = np.meshgrid(*[np.linspace(0, 1, n)] * 3, indexing='ij')
+    points = vtkPoints()
+    points.SetData(numpy_to_vtk(
+        np.stack((x, y, z), axis=-1).reshape(-1, 3).copy(), deep=True))
+
+    i, j, k = np.meshgrid(*[np.arange(cells)] * 3, indexing='ij')
+    base = (i * n * n + j * n + k).reshape(-1)
+    corners = np.array((0, n * n, n * n + n, n,
+                        1, n * n + 1, n * n + n + 1, n + 1))
+    hexes = np.empty((len(base), 9), dtype=np.int64)
+    hexes[:, 0] = 8
+    hexes[:, 1:] = base[:, None] + corners
+    cells_array = vtkCellArray()
+    cells_array.SetCells(len(base), numpy_to_vtkIdTypeArray(
+        hexes.reshape(-1), deep=True))
+
+    grid = vtkUnstructuredGrid()
+    grid.SetPoints(points)
+    grid.SetCells(VTK_HEXAHEDRON, cells_array)
+    return grid
+
+
+def build_scene(args, mode):
+    scene = VtkScene(*args.size)
+    lod = {'lod': True, 'quadric': 'quadric'}.get(mode, False)
+    side = max(1, int(math.ceil(math.sqrt(args.spheres + args.cubes))))
+    for i in range(args.spheres + args.cubes):
+        if i < args.spheres:
+            obj = Sphere()
+        else:
+            obj = Cube()
+        obj.position = (3 * (i % side) - 1.5 * side,
+                        3 * (i // side) - 1.5 * side, -5)
+        scene.add_object(obj, reset_camera=False)
+    if args.stl_triangles > 0:
+        data = stl_data(int(args.stl_triangles * 1e6))
+        scene.add_object(VtkNumpySTL(data, lod=lod), reset_camera=False)
+    if args.grid_cells > 0:
+        grid = SimpleGeometry(name='internalMesh', source=hex_grid(
+            args.grid_cells), lod=lod)
+        grid.position = (0, 0, 5)
+        scene.add_object(grid, reset_camera=False)
+
+    # Frames render inline with the events, without an event loop.
+    scene.scheduler.fps = 0
+    scene.scheduler.min_interval = 0
+    if mode == 'lod':
+        # Uncapped frames leave LOD without a frame budget.
+        scene.lod.budget = args.lod_budget
+    elif mode == 'reduced':
+        scene.interactive_scale = args.scale
+    elif mode == 'pbo':
+        scene.readback = PixelBufferReadback()
+    scene.reset_camera()
+    return scene
+
+
+def orbit(scene, frames, size):
+    """
+    Rotates camera once around the scene by dragging with the left button.
+    """
+    cx, cy = size[0] // 2, size[1] // 2
+    radius = min(cx, cy) // 2
+    scene.mouse_press(BasicInteractor.LeftButton, cx + radius, cy, 0)
+    for i in range(1, frames + 1):
+        angle = 2 * math.pi * i / frames
+        scene.mouse_move(int(cx + radius * math.cos(angle)),
+                         int(cy + radius * math.sin(angle)), 0)
+        # Moves wait for the next frame, which the uncapped scheduler
+        # renders inline; flushing covers moves without a frame.
+        scene.interactor.flush_events()
+    scene.mouse_release(BasicInteractor.LeftButton, cx + radius, cy, 0)
+
+
+def run_mode(args, mode):
+    start = perf_counter()
+    scene = build_scene(args, mode)
+    build_time = perf_counter() - start
+
+    # Warm up shaders and buffers before measuring.
+    orbit(scene, max(1, args.frames // 10), args.size)
+    if mode == 'lod':
+        scene.lod.build()
+        scene.lod.wait()
+    scene.frame_stats.clear()
+    scene.frame_stats.enabled = True
+    scene.scheduler.reset_stats()
+
+    start = perf_counter()
+    orbit(scene, args.frames, args.size)
+    if mode == 'pbo':
+        scene.readback.flush()
+    elapsed = perf_counter() - start
+
+    frames = scene.scheduler.stats['frames']
+    result = scene.frame_stats.summary()
+    result.update(
+        mode=mode,
+        build_time=build_time,
+        frames=frames,
+        fps=frames / elapsed if elapsed > 0 else 0.0,
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        )
+    scene.delete()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--spheres', type=int, default=100)
+    parser.add_argument('--cubes', type=int, default=100)
+    parser.add_argument('--stl-triangles', type=float, default=1.0,
+                        help='Millions of triangles of the STL mesh.')
+    parser.add_argument('--grid-cells', type=int, default=50,
+                        help='Hexahedra along each side of the grid.')
+    parser.add_argument('--frames', type=int, default=200,
+                        help='Frames per orbit.')
+    parser.add_argument('--size', type=int, nargs=2, default=(1280, 720))
+    parser.add_argument('--scale', type=float, default=0.5,
+                        help='Render scale of the reduced mode.')
+    parser.add_argument('--lod-budget', type=float, default=1.0 / 60,
+                        help='Frame time in seconds of the lod mode.')
+    parser.add_argument('--modes', nargs='+', choices=MODES,
+                        default=list(MODES))
+    parser.add_argument('--output', help='Write JSON to file.')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for mode in args.modes:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_mode, (args, mode)))
+
+    report = dict(
+        platform=platform.platform(),
+        python=platform.python_version(),
+        vtk=vtk.vtkVersion.GetVTKVersion(),
+        config=dict(spheres=args.spheres, cubes=args.cubes,
+                    stl_triangles=args.stl_triangles,
+                    grid_cells=args.grid_cells, frames=args.frames,
+                    size=list(args.size), scale=args.scale),
+        results=results
+        )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
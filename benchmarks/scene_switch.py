@@ -0,0 +1,71 @@
+"""
+Measures the cost of switching rendering between scenes with renderers
+migrating into the shared offscreen window and with a pool of persistent
+per-scene windows.
+
+Usage: python benchmarks/scene_switch.py [--scenes 4] [--switches 100]
+"""
+# Standard Python modules
+# =======================
+import argparse
+import json
+from time import perf_counter
+
+# DICE modules
+# ============
+from dice_vtk import VtkScene
+from dice_vtk.scene import RenderWindowProxy
+from dice_vtk.geometries import Sphere
+
+
+def build_scenes(count, resolution, size):
+    scenes = []
+    for i in range(count):
+        scene = VtkScene(*size)
+        sphere = Sphere()
+        sphere.source.SetThetaResolution(resolution)
+        sphere.source.SetPhiResolution(resolution)
+        scene.add_object(sphere)
+        scenes.append(scene)
+    return scenes
+
+
+def measure(scenes, switches):
+    for scene in scenes:
+        scene.render_window.Render()
+    times = []
+    for i in range(switches):
+        scene = scenes[i % len(scenes)]
+        start = perf_counter()
+        scene.render_window.Render()
+        times.append(perf_counter() - start)
+    times.sort()
+    return dict(
+        mean=sum(times) / len(times),
+        median=times[len(times) // 2],
+        max=times[-1]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--scenes', type=int, default=4)
+    parser.add_argument('--switches', type=int, default=100)
+    parser.add_argument('--resolution', type=int, default=1000,
+                        help='Sphere theta and phi resolution.')
+    parser.add_argument('--size', type=int, nargs=2, default=(1280, 720))
+    args = parser.parse_args()
+
+    results = {}
+    for name, pool_size in (('migration', 0), ('pool', args.scenes)):
+        RenderWindowProxy.window_pool_size = pool_size
+        scenes = build_scenes(args.scenes, args.resolution, args.size)
+        results[name] = measure(scenes, args.switches)
+        for scene in scenes:
+            scene.render_window.evict()
+            scene.delete()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
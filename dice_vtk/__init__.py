@@ -2,6 +2,21 @@ __all__ = [
     'VtkScene', 'VisApp', '__VERSION__'
 ]
 
-from .scene import VtkScene
-from .app import VisApp
-from .animation import VtkSceneAnimation
+import importlib
+
+# Exports are imported on first access, so headless tools like
+# dice_vtk.render do not need the GUI stack of the scene and the app.
+_exports = {
+    'VtkScene': '.scene',
+    'VisApp': '.app',
+    'VtkSceneAnimation': '.animation',
+}
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(importlib.import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
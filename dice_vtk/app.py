@@ -33,6 +33,7 @@ class VisApp:
         wizard.subscribe('w_idle', self.__save_config)
 
         self.__scenes = {}
+        self.__render_backend = None
         self.__prepare_config()
         if not self.__scenes:
             self.vis_add_scene('Scene_1', 'default')
@@ -108,7 +109,7 @@ class VisApp:
             with open(self.config_path('vis.json'), 'w') as f:
                 json.dump(self.__config, f)
 
-    def w_scene_camera_updated(self, scene, **kwargs):
+    def w_scene_camera_settled(self, scene, **kwargs):
         for k, v in self.__scenes.items():
             if v == scene:
                 for s in self.__config['scenes']:
@@ -160,6 +161,7 @@ class VisApp:
                     break
 
         scene = VtkScene(200, 200)
+        scene.render_backend = self.__render_backend
         scene.tag = tag
         scene.scene_name = scene_name
         if save:
@@ -168,8 +170,7 @@ class VisApp:
             self.__save_cfg_pending = True
 
         for v in self.vis_scenes_by_tag(tag):
-            for o in v.objects:
-                scene.add_object(o)
+            scene.add_objects(v.objects)
             break
 
         wizard.subscribe(self, scene)
@@ -180,6 +181,16 @@ class VisApp:
         if activate:
             self.vis_activate_scene(idx)
 
+    def vis_set_render_backend(self, backend):
+        """
+        Sets render backend of all scenes in application.
+        :param backend: Backend like ParallelRenderer or None to render
+        scenes one after another.
+        """
+        self.__render_backend = backend
+        for v in self.__scenes.values():
+            v.render_backend = backend
+
     def vis_add_object(self, obj, tag='default', reset_camera=True):
         """
         Adds geometry object to all scenes in application.
@@ -189,6 +200,16 @@ class VisApp:
             if v.tag == tag:
                 v.add_object(obj, reset_camera)
 
+    def vis_add_objects(self, objs, tag='default', reset_camera=True):
+        """
+        Adds many geometry objects to all scenes in application at once.
+        :param objs: Iterable of geometry objects.
+        """
+        objs = list(objs)
+        for v in self.__scenes.values():
+            if v.tag == tag:
+                v.add_objects(objs, reset_camera)
+
     def vis_remove_object(self, obj):
         """
         Removes geometry object from all scenes in application.
@@ -197,6 +218,15 @@ class VisApp:
         for v in self.__scenes.values():
             v.remove_object(obj)
 
+    def vis_remove_objects(self, objs):
+        """
+        Removes many geometry objects from all scenes in application at once.
+        :param objs: Iterable of geometry objects.
+        """
+        objs = list(objs)
+        for v in self.__scenes.values():
+            v.remove_objects(objs)
+
     def vis_clear(self, tag = 'default'):
         """
         Removes all geometry object from all scenes in application.
@@ -0,0 +1,136 @@
+# Standard Python modules
+# =======================
+import io
+import threading
+import traceback
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# External modules
+# ================
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# DICE modules
+# ============
+
+
+class FrameEncoder:
+    """
+    Encodes rendered frames in a pool of worker threads, so encoding of one
+    frame overlaps with rendering of the next one. When all workers are busy
+    only the latest submitted frame is kept waiting and older ones are
+    dropped.
+
+    Encoded frames are passed to callback(sequence, size, format, payload)
+    from the worker threads. Frames finished out of order are dropped, so
+    sequence numbers given to callback always grow.
+    """
+
+    formats = ('png', 'jpeg', 'zlib', 'lz4')
+
+    def __init__(self, callback, format='jpeg', quality=80, workers=2):
+        """
+        :param callback: Callable taking (sequence, size, format, payload).
+        :param format: One of 'png', 'jpeg' (require Pillow), 'zlib' or
+        'lz4' (requires lz4). Raw formats keep RGBA rows bottom-up.
+        :param quality: JPEG quality.
+        :param workers: Number of worker threads.
+        """
+        if format not in self.formats:
+            raise ValueError('Unknown frame format: {}'.format(format))
+        if format in ('png', 'jpeg') and Image is None:
+            raise ImportError('Pillow is required to encode {}'.format(format))
+        if format == 'lz4' and lz4 is None:
+            raise ImportError('lz4 is required to encode lz4')
+        self.__callback = callback
+        self.__format = format
+        self.__quality = quality
+        self.__workers = workers
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+        self.__lock = threading.Lock()
+        self.__emit_lock = threading.Lock()
+        self.__busy = 0
+        self.__waiting = None
+        self.__sequence = 0
+        self.__emitted = 0
+        self.__dropped = 0
+
+    @property
+    def format(self):
+        return self.__format
+
+    @property
+    def dropped(self):
+        """
+        Number of frames dropped because the encoder fell behind.
+        """
+        return self.__dropped
+
+    def submit(self, size, data):
+        """
+        Queues frame for encoding and returns its sequence number.
+
+        :param size: Frame size.
+        :param data: RGBA pixels. Copied before return.
+        """
+        data = bytes(data)
+        with self.__lock:
+            self.__sequence += 1
+            frame = (self.__sequence, tuple(size), data)
+            if self.__busy < self.__workers:
+                self.__busy += 1
+            else:
+                if self.__waiting is not None:
+                    self.__dropped += 1
+                self.__waiting = frame
+                frame = None
+        if frame is not None:
+            self.__executor.submit(self.__run, frame)
+        return self.__sequence
+
+    def shutdown(self, wait=True):
+        self.__executor.shutdown(wait)
+
+    def __run(self, frame):
+        while frame is not None:
+            sequence, size, data = frame
+            try:
+                payload = self.__encode(size, data)
+                with self.__emit_lock:
+                    if sequence < self.__emitted:
+                        with self.__lock:
+                            self.__dropped += 1
+                    else:
+                        self.__emitted = sequence
+                        self.__callback(sequence, size, self.__format,
+                                        payload)
+            except Exception:
+                traceback.print_exc()
+            with self.__lock:
+                frame = self.__waiting
+                self.__waiting = None
+                if frame is None:
+                    self.__busy -= 1
+
+    def __encode(self, size, data):
+        if self.__format == 'zlib':
+            return zlib.compress(data, 1)
+        if self.__format == 'lz4':
+            return lz4.frame.compress(data)
+        # OpenGL rows go bottom-up, images are stored top-down.
+        image = Image.frombuffer('RGBA', size, data, 'raw', 'RGBA', 0, -1)
+        stream = io.BytesIO()
+        if self.__format == 'jpeg':
+            image.convert('RGB').save(stream, format='JPEG',
+                                      quality=self.__quality)
+        else:
+            image.save(stream, format='PNG', compress_level=1)
+        return stream.getvalue()
@@ -0,0 +1,94 @@
+# Standard Python modules
+# =======================
+
+# External modules
+# ================
+import numpy as np
+
+# DICE modules
+# ============
+
+
+class TileDiffer:
+    """
+    Splits frames into square tiles and finds tiles which changed since the
+    previous frame. Rows of the frame go bottom-up as read from OpenGL, so
+    tile coordinates have their origin in the lower left corner.
+    """
+
+    def __init__(self, tile_size=64):
+        if tile_size < 1:
+            raise ValueError('Tile size must be positive')
+        self.__tile_size = tile_size
+        self.__previous = None
+
+    @property
+    def tile_size(self):
+        return self.__tile_size
+
+    def reset(self):
+        """
+        Forgets the previous frame, so the next one is reported as a whole.
+        """
+        self.__previous = None
+
+    def diff(self, size, data):
+        """
+        Compares frame with the previous one.
+
+        :param size: Frame size.
+        :param data: RGBA pixels (bytes, memoryview or numpy array).
+        :return: List of changed rectangles (x, y, width, height, pixels),
+        where adjacent tiles of one tile row are merged and pixels is a
+        uint32 numpy view valid until the next diff. Empty list when the
+        frame did not change, one rectangle covering the frame when there
+        is no previous frame to compare with.
+        """
+        width, height = size[0], size[1]
+        frame = np.frombuffer(data, dtype=np.uint32,
+                              count=width * height).reshape(height, width)
+        previous = self.__previous
+        if previous is None or previous.shape != frame.shape:
+            self.__previous = frame.copy()
+            return [(0, 0, width, height, self.__previous)]
+
+        t = self.__tile_size
+        changed = frame != previous
+        dirty = np.logical_or.reduceat(
+            np.logical_or.reduceat(changed, np.arange(0, height, t), axis=0),
+            np.arange(0, width, t), axis=1)
+        if not dirty.any():
+            return []
+
+        tiles = []
+        for row in np.flatnonzero(dirty.any(axis=1)):
+            columns = np.flatnonzero(dirty[row])
+            breaks = np.flatnonzero(np.diff(columns) > 1) + 1
+            for run in np.split(columns, breaks):
+                x0 = int(run[0]) * t
+                x1 = min((int(run[-1]) + 1) * t, width)
+                y0 = int(row) * t
+                y1 = min(y0 + t, height)
+                tiles.append((x0, y0, x1 - x0, y1 - y0,
+                              previous[y0:y1, x0:x1]))
+        # Tiles are views of the copy, they are not serialized here.
+        np.copyto(previous, frame)
+        return tiles
+
+
+def upsample(data, size, new_size):
+    """
+    Scales RGBA frame to new_size with nearest neighbour sampling.
+
+    :param data: RGBA pixels of the frame.
+    :param size: Frame size.
+    :param new_size: Size of the result.
+    :return: memoryview over RGBA pixels of the scaled frame.
+    """
+    width, height = size[0], size[1]
+    new_width, new_height = new_size[0], new_size[1]
+    frame = np.frombuffer(data, dtype=np.uint32,
+                          count=width * height).reshape(height, width)
+    rows = np.arange(new_height) * height // new_height
+    columns = np.arange(new_width) * width // new_width
+    return memoryview(frame[rows[:, None], columns]).cast('B')
@@ -1,3 +1,4 @@
+from .geometry_base import geometry_batch
 from .arrow import Arrow
 from .cone import Cone
 from .cone_2_radius import Cone2Radius
@@ -29,4 +30,5 @@ from .vtk_numpy_stl import VtkNumpySTL
 from .transform_gismo import TransformGismo
 #from .vtk_numpy_obj import VtkNumpyOBJ
 from .dynamic_sphere import DynamicSphere
+from .primitive_collection import PrimitiveCollection
 from .scalarbar_widget import ScalarBarWidget
@@ -32,7 +32,7 @@ class Cone(SimpleGeometry):
 
     @height.setter
     def height(self, value):
-        self.source.SetHeight(value)
+        self.set_source_param('SetHeight', value)
 
     @GeometryProperty
     def radius(self):
@@ -40,7 +40,7 @@ class Cone(SimpleGeometry):
 
     @radius.setter
     def radius(self, value):
-        self.source.SetRadius(value)
+        self.set_source_param('SetRadius', value)
 
     @GeometryProperty
     def resolution(self):
@@ -48,7 +48,7 @@ class Cone(SimpleGeometry):
 
     @resolution.setter
     def resolution(self, value):
-        self.source.SetResolution(value)
+        self.set_source_param('SetResolution', value)
 
     @GeometryProperty
     def direction(self):
@@ -56,7 +56,7 @@ class Cone(SimpleGeometry):
 
     @direction.setter
     def direction(self, value):
-        self.source.SetDirection(value)
+        self.set_source_param('SetDirection', value)
 
     @GeometryProperty
     def capping(self):
@@ -64,6 +64,6 @@ class Cone(SimpleGeometry):
 
     @capping.setter
     def capping(self, value):
-        self.source.SetCapping(value)
+        self.set_source_param('SetCapping', value)
 
 
@@ -27,7 +27,7 @@ class Cube(SimpleGeometry):
 
     @x_length.setter
     def x_length(self, value):
-        self.source.SetXLength(value)
+        self.set_source_param('SetXLength', value)
 
     @GeometryProperty
     def y_length(self):
@@ -35,7 +35,7 @@ class Cube(SimpleGeometry):
 
     @y_length.setter
     def y_length(self, value):
-        self.source.SetYLength(value)
+        self.set_source_param('SetYLength', value)
 
     @GeometryProperty
     def z_length(self):
@@ -43,4 +43,4 @@ class Cube(SimpleGeometry):
 
     @z_length.setter
     def z_length(self, value):
-        self.source.SetZLength(value)
+        self.set_source_param('SetZLength', value)
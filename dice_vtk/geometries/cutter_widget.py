@@ -68,7 +68,7 @@ from vtk import vtkCutter, \
 from vtk import vtkBoundingBox
 
 from .simple_geometry import SimpleGeometry
-from .geometry_base import GeometryProperty
+from .geometry_base import GeometryProperty, property_changed
 from dice_tools import wizard
 
 
@@ -116,7 +116,7 @@ class CutterWidget(SimpleGeometry):
         self.__crinkle = False
         self.__modified = True
 
-        bounds = self.__target.get_bounds(None)
+        bounds = self.__target.cached_bounds(None)
         center = [(a+b)/2.0 for a, b in zip(bounds[::2], bounds[1::2])]
         for i in range(0, 6, 2):
             ext = (bounds[i+1] - bounds[i]) * 0.1 / 2
@@ -171,10 +171,8 @@ class CutterWidget(SimpleGeometry):
 
     def on_interaction(self):
         self.__normal = self.__rep_actor.GetNormal()
-        wizard.w_property_changed(self,
-            name = "plane_normal", value = self.plane_normal)
-        wizard.w_property_changed(self,
-            name = "plane_origin", value = self.plane_origin)
+        property_changed(self, "plane_normal", self.plane_normal)
+        property_changed(self, "plane_origin", self.plane_origin)
 
     def set_selected(self, enable):
         super().set_selected(enable)
@@ -27,7 +27,7 @@ class Cylinder(SimpleGeometry):
 
     @radius.setter
     def radius(self, value):
-        self.source.SetRadius(value)
+        self.set_source_param('SetRadius', value)
 
     @GeometryProperty
     def height(self):
@@ -35,7 +35,7 @@ class Cylinder(SimpleGeometry):
 
     @height.setter
     def height(self, value):
-        self.source.SetHeight(value)
+        self.set_source_param('SetHeight', value)
 
     @GeometryProperty
     def resolution(self):
@@ -43,5 +43,5 @@ class Cylinder(SimpleGeometry):
 
     @resolution.setter
     def resolution(self, value):
-        self.source.SetResolution(value)
+        self.set_source_param('SetResolution', value)
 
@@ -34,31 +34,22 @@ class WidgetInstance(BasicInteractor):
         self.actor.GetProperty().SetOpacity(self.parent.opacity)
         self.actor.GetProperty().SetRepresentation(self.parent.representation)
         self.actor.GetProperty().SetEdgeVisibility(self.parent.edge_visible)
+        scaler = self.scene.handle_scaler
         if self.parent.target:
-            size = self.actor.GetXRange()
-            apos = self.actor.GetPosition()
-            self.renderer.SetWorldPoint(*apos, 1)
-            self.renderer.WorldToView()
-            pt = self.renderer.GetViewPoint()
-            pos = (pt[0] + 0.05, pt[1], pt[2])
-            self.renderer.SetViewPoint(*pos)
-            self.renderer.ViewToWorld()
-            zpos = self.renderer.GetWorldPoint()
-            scale = math.sqrt(vtkMath.Distance2BetweenPoints(apos, zpos[:3]))
-            target_bounds = self.parent.target.get_bounds(self.scene)
+            target_bounds = self.parent.target.cached_bounds(self.scene)
             dist = min((target_bounds[i+1]-target_bounds[i] for i in range(0, 6, 2)))
-            scale = min(scale, dist/3.0)
-            self.actor.SetScale(scale, scale, scale)
+            scaler.add(self.actor, 0.05, dist/3.0)
+            scaler.update((self.actor,))
+        else:
+            scaler.remove(self.actor)
 
     def destroy(self, scene):
+        scene.handle_scaler.remove(self.actor)
         scene.renderer.RemoveActor(self.actor)
 
     def w_scene_actor_clicked(self, actor, x, y, control_modifier):
         wizard.w_geometry_object_clicked(self.parent, x, y, control_modifier)
 
-    def w_scene_camera_updated(self, scene, *args, **kwargs):
-        self.update()
-
 
 class DynamicSphere(GeometryBase):
 
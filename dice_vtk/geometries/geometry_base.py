@@ -2,6 +2,8 @@
 # =======================
 import weakref
 from abc import ABCMeta, abstractmethod, abstractproperty
+from collections import OrderedDict
+from contextlib import contextmanager
 
 # External modules
 # ================
@@ -15,6 +17,43 @@ from vtk import vtkBoundingBox
 from dice_tools import wizard
 
 
+# Changes collected by the outermost geometry_batch, empty outside of it.
+_batch = []
+
+
+@contextmanager
+def geometry_batch():
+    """
+    Defers property change notifications of geometry objects.
+
+    Inside the block w_property_changed is not broadcast. When the outermost
+    block exits w_geometry_batch_changed(changes) is broadcast once, where
+    changes is a dict {obj: {name: value}} with the last value set for every
+    changed property. Blocks may be nested.
+    """
+    outermost = not _batch
+    if outermost:
+        _batch.append(OrderedDict())
+    try:
+        yield
+    finally:
+        if outermost:
+            changes = _batch.pop()
+            if changes:
+                wizard.w_geometry_batch_changed(changes)
+
+
+def property_changed(obj, name, value):
+    """
+    Notifies about changed property of geometry object, deferred while a
+    geometry_batch is open.
+    """
+    if _batch:
+        _batch[0].setdefault(obj, {})[name] = value
+    else:
+        wizard.w_property_changed(obj, name=name, value=value)
+
+
 class VisObject(metaclass=ABCMeta):
 
     @abstractmethod
@@ -40,8 +79,7 @@ class GeometryProperty(property):
 
     def __fset(self, obj, value):
         self.__setter(obj, value)
-        wizard.w_property_changed(obj,
-            name = self.name, value = value)
+        property_changed(obj, self.name, value)
 
     def __call__(self, fget):
         return self.getter(fget)
@@ -71,6 +109,7 @@ class GeometryBase(VisObject, metaclass=GeometryBaseMeta):
         self.__name = name
         self.__selected = False
         self.__saved_color = None
+        self.__bounds_cache = None
 
     @GeometryProperty
     def name(self):
@@ -84,6 +123,43 @@ class GeometryBase(VisObject, metaclass=GeometryBaseMeta):
     def get_bounds(self, scene):
         pass
 
+    def bounds_mtime(self):
+        """
+        Returns the latest modification time of actors, mappers, mapper
+        inputs and sources, None when the object has no actors.
+        """
+        actors = self.get_actors()
+        if not actors:
+            return None
+        mtime = 0
+        for v in actors:
+            mtime = max(mtime, v.GetMTime())
+            mapper = v.GetMapper()
+            if mapper:
+                mtime = max(mtime, mapper.GetMTime())
+                data = mapper.GetInputDataObject(0, 0)
+                if data:
+                    mtime = max(mtime, data.GetMTime())
+        for v in self.get_sources():
+            mtime = max(mtime, v.GetMTime())
+        return mtime
+
+    def cached_bounds(self, scene):
+        """
+        Returns get_bounds(scene), reusing the previous result until
+        bounds_mtime changes. Objects with actors are assumed to have the
+        same bounds in every scene, objects without actors are not cached.
+        """
+        mtime = self.bounds_mtime()
+        if mtime is None:
+            return self.get_bounds(scene)
+        cache = self.__bounds_cache
+        if cache is None or cache[0] != mtime:
+            bounds = tuple(self.get_bounds(scene))
+            # Computing bounds may update the pipeline and modify its data.
+            cache = self.__bounds_cache = (self.bounds_mtime(), bounds)
+        return list(cache[1])
+
     @abstractmethod   
     def get_sources(self):
         pass
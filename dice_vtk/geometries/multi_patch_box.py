@@ -35,6 +35,7 @@ class WidgetInstance(BasicInteractor):
             actor.SetMapper(mapper)
             self.__handles.append(actor)
             scene.renderer.AddActor(actor)
+            scene.handle_scaler.add(actor, 0.05)
             wizard.subscribe(self, actor)
         self.update()
         wizard.subscribe(self, scene)
@@ -53,9 +54,12 @@ class WidgetInstance(BasicInteractor):
             else:
                 self.__handles[i].GetProperty().SetColor(1, 1, 1)
             self.__handles[i].SetVisibility(self.parent.visible)
+        self.rescale()
 
     def destroy(self, scene):
-        pass
+        for actor in self.__handles:
+            scene.handle_scaler.remove(actor)
+            scene.renderer.RemoveActor(actor)
 
     def w_scene_actor_clicked(self, actor, x, y, control_modifier):
         for i, v in enumerate(self.__handles):
@@ -72,24 +76,13 @@ class WidgetInstance(BasicInteractor):
                 self.scene.push_interactor(self)
                 return
 
-    def w_scene_camera_updated(self, scene, *args, **kwargs):
+    def rescale(self):
+        scaler = self.scene.handle_scaler
         for i, handle in enumerate(self.__handles):
-            size = handle.GetXRange()
-            apos = handle.GetPosition()
-            self.renderer.SetWorldPoint(*apos, 1)
-            self.renderer.WorldToView()
-            pt = self.renderer.GetViewPoint()
-            pos = (pt[0] + 0.05, pt[1], pt[2])
-            self.renderer.SetViewPoint(*pos)
-            self.renderer.ViewToWorld()
-            zpos = self.renderer.GetWorldPoint()
-            scale = math.sqrt(vtkMath.Distance2BetweenPoints(apos, zpos[:3]))
-
             dist = min((self.parent.max[j] - self.parent.min[j] for j in range(3)
                    if (i != j) and (i != (j + 3))))
-
-            scale = min(scale, dist/3.0)
-            handle.SetScale(scale, scale, scale)
+            scaler.set_limit(handle, dist/3.0)
+        scaler.update(self.__handles)
 
     def mouse_release(self, btn, x, y, modifiers):
         self.scene.pop_interactor()
@@ -0,0 +1,233 @@
+# Standard Python modules
+# =======================
+
+# External modules
+# ================
+import numpy as np
+from vtk import vtkGlyph3DMapper
+from vtk import vtkPoints
+from vtk import vtkPolyData
+from vtk import vtkSphereSource
+from vtk.util.numpy_support import numpy_to_vtk
+
+# DICE modules
+# ============
+from .simple_geometry import SimpleGeometry
+from .geometry_base import GeometryProperty, property_changed
+from dice_tools import wizard
+
+
+class PrimitiveCollection(SimpleGeometry):
+    """
+    Many instances of one primitive rendered by a single vtkGlyph3DMapper.
+
+    Instances are described by numpy arrays: positions (n, 3), scales (n,)
+    or (n, 3), orientations (n, 3) as rotation angles in degrees about the
+    x, y and z axes, and colors (n, 3) or (n, 4) as floats in [0, 1] or
+    uint8. The arrays are copied into buffers shared with VTK, so assigning
+    arrays with the same number of instances only marks the buffers
+    modified, the pipeline is rebuilt only when the number changes.
+
+    Instances are picked by their bounding spheres, picking an instance
+    broadcasts w_primitive_collection_picked(obj, index, position).
+    """
+
+    def __init__(self, positions, scales=None, orientations=None,
+                 colors=None, shape=vtkSphereSource,
+                 name='PrimitiveCollection', **kwargs):
+        """
+        :param positions: Array of instance positions.
+        :param scales: Array of instance scales, 1 by default.
+        :param orientations: Array of instance rotations, none by default.
+        :param colors: Array of instance colors, object color by default.
+        :param shape: Primitive source class or instance.
+        """
+        self.__poly = vtkPolyData()
+        self.__arrays = {}
+        mapper = vtkGlyph3DMapper()
+        mapper.SetScaleModeToScaleByVectorComponents()
+        mapper.SetOrientationModeToRotation()
+        mapper.SetColorModeToDirectScalars()
+        mapper.SetScalarModeToUsePointFieldData()
+        super().__init__(name=name, source=self.__poly, mapper=mapper,
+                         **kwargs)
+
+        self.__shape = None
+        self.__radius = 0.0
+        self.shape = shape
+        self.positions = positions
+        self.scales = scales
+        self.orientations = orientations
+        self.colors = colors
+
+        self.actor.intersect_with_line = self.intersect_with_line
+        wizard.subscribe(self.w_scene_actor_picked, actor=self.actor)
+
+    def w_scene_actor_picked(self, actor, cell_id, position):
+        wizard.w_primitive_collection_picked(self, cell_id, position)
+
+    def get_sources(self):
+        return (self.__poly, self.__shape)
+
+    def __len__(self):
+        return self.__poly.GetNumberOfPoints()
+
+    def __buffer(self, name, value, shape, dtype):
+        """
+        Copies value into the buffer of array name, allocating a new buffer
+        only when its shape changes.
+
+        :return: Tuple (buffer, vtk array), vtk array is None when the buffer
+        was reused.
+        """
+        value = np.asarray(value)
+        current = self.__arrays.get(name)
+        if current is not None and current[0].shape == shape:
+            np.copyto(current[0], np.broadcast_to(value, shape),
+                      casting='unsafe')
+            current[1].Modified()
+            return current[0], None
+        buffer = np.empty(shape, dtype=dtype)
+        np.copyto(buffer, np.broadcast_to(value, shape), casting='unsafe')
+        array = numpy_to_vtk(buffer)
+        array.SetName(name)
+        # numpy_to_vtk does not own the memory, the buffer is kept alive here.
+        self.__arrays[name] = (buffer, array)
+        return buffer, array
+
+    def __changed(self, name):
+        self.__poly.Modified()
+        property_changed(self, name, self.__arrays[name][0])
+
+    @GeometryProperty
+    def shape(self):
+        return self.__shape
+
+    @shape.setter
+    def shape(self, value):
+        if isinstance(value, type):
+            value = value()
+        self.__shape = value
+        if value.IsA('vtkAlgorithm'):
+            self.mapper.SetSourceConnection(value.GetOutputPort())
+            value.Update()
+            data = value.GetOutputDataObject(0)
+        else:
+            self.mapper.SetSourceData(value)
+            data = value
+        # Bounding sphere of the primitive around the instance origin.
+        bounds = np.array(data.GetBounds()).reshape(3, 2)
+        self.__radius = np.linalg.norm(np.abs(bounds).max(axis=1))
+
+    @property
+    def positions(self):
+        return self.__arrays['positions'][0]
+
+    @positions.setter
+    def positions(self, value):
+        value = np.asarray(value).reshape((-1, 3))
+        count = len(value)
+        resized = count != len(self)
+        buffer, array = self.__buffer('positions', value, (count, 3), 'f8')
+        if array is not None:
+            points = vtkPoints()
+            points.SetData(array)
+            self.__poly.SetPoints(points)
+        if resized:
+            # Instance arrays follow the new count with default values.
+            for name in ('scales', 'orientations', 'colors'):
+                if name in self.__arrays:
+                    setattr(self, name, None)
+        self.__changed('positions')
+
+    @property
+    def scales(self):
+        return self.__arrays['scales'][0]
+
+    @scales.setter
+    def scales(self, value):
+        if value is None:
+            value = 1.0
+        value = np.asarray(value, dtype='f8')
+        if value.ndim == 1 and value.shape[0] == len(self):
+            value = value[:, None]
+        buffer, array = self.__buffer('scales', value, (len(self), 3), 'f8')
+        if array is not None:
+            self.__poly.GetPointData().AddArray(array)
+            self.mapper.SetScaleArray('scales')
+            self.mapper.ScalingOn()
+        self.__changed('scales')
+
+    @property
+    def orientations(self):
+        return self.__arrays['orientations'][0]
+
+    @orientations.setter
+    def orientations(self, value):
+        if value is None:
+            value = 0.0
+        buffer, array = self.__buffer('orientations', value,
+                                      (len(self), 3), 'f8')
+        if array is not None:
+            self.__poly.GetPointData().AddArray(array)
+            self.mapper.SetOrientationArray('orientations')
+            self.mapper.OrientOn()
+        self.__changed('orientations')
+
+    @property
+    def colors(self):
+        return self.__arrays['colors'][0]
+
+    @colors.setter
+    def colors(self, value):
+        if value is None:
+            self.mapper.ScalarVisibilityOff()
+            value = 255
+        else:
+            value = np.asarray(value)
+            if value.dtype.kind == 'f':
+                value = np.clip(value * 255.0 + 0.5, 0, 255)
+            if value.shape[-1] == 3:
+                alpha = np.full(value.shape[:-1] + (1,), 255, value.dtype)
+                value = np.concatenate((value, alpha), axis=-1)
+            self.mapper.ScalarVisibilityOn()
+        buffer, array = self.__buffer('colors', value, (len(self), 4), 'u1')
+        if array is not None:
+            self.__poly.GetPointData().AddArray(array)
+            self.mapper.SelectColorArray('colors')
+        self.__changed('colors')
+
+    def intersect_with_line(self, p0, p1):
+        """
+        Intersects segment p0-p1 in world coordinates with the bounding
+        spheres of instances.
+
+        :return: Tuple (t, index) of the instance closest to p0 or None.
+        """
+        count = len(self)
+        if not count:
+            return None
+        matrix = self.actor.GetMatrix()
+        m = np.array([[matrix.GetElement(i, j) for j in range(4)]
+                      for i in range(4)])
+        inverse = np.linalg.inv(m)
+        a, b = (inverse.dot(tuple(v) + (1.0,)) for v in (p0, p1))
+        a = a[:3] / a[3]
+        b = b[:3] / b[3]
+        d = b - a
+        dd = d.dot(d)
+        if dd == 0:
+            return None
+        centers = self.positions - a
+        radii = self.__radius * np.abs(self.scales).max(axis=1)
+        t = centers.dot(d) / dd
+        distance = np.einsum('ij,ij->i', centers, centers) - t * t * dd
+        hit = distance <= radii * radii
+        if not hit.any():
+            return None
+        t = t - np.sqrt(np.maximum(radii * radii - distance, 0) / dd)
+        t = np.where(hit & (t <= 1), np.maximum(t, 0), np.inf)
+        index = int(np.argmin(t))
+        if not np.isfinite(t[index]):
+            return None
+        return float(t[index]), index
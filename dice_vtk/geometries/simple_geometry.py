@@ -1,5 +1,6 @@
 # Standard Python modules
 # =======================
+import weakref
 
 # External modules
 # ================
@@ -19,20 +20,110 @@ from vtk import vtkCompositeDataGeometryFilter
 from .geometry_base import GeometryBase, GeometryProperty
 from dice_tools import wizard
 
+
+# Shared sources of geometry objects created with shared=True, keyed by
+# source class and source parameters.
+_shared = weakref.WeakValueDictionary()
+
+# Default instances of shared source classes, parameters are compared with.
+_defaults = {}
+
+
+class SharedSource:
+    """
+    Source shared by geometry objects with equal source class and
+    parameters. An entry lives as long as a geometry object uses it.
+    """
+    def __init__(self, source_type, params):
+        self.source_type = source_type
+        self.params = params
+        self.source = source_type()
+        for name, args in params:
+            getattr(self.source, name)(*args)
+
+    @staticmethod
+    def get(source_type, params=()):
+        """
+        Returns shared source for source class and parameters.
+
+        :param params: Sorted tuple of (setter name, arguments).
+        """
+        key = (source_type, params)
+        entry = _shared.get(key)
+        if entry is None:
+            entry = SharedSource(source_type, params)
+            _shared[key] = entry
+        return entry
+
+    def derive(self, name, args):
+        """
+        Returns shared source with setter name called with args on top of
+        parameters of this one. Parameters equal to the defaults of the
+        source class are left out, so they map to the same entry.
+        """
+        args = self.__normalize(args)
+        params = dict(self.params)
+        if args == self.__default(name):
+            params.pop(name, None)
+        else:
+            params[name] = args
+        return SharedSource.get(self.source_type,
+                                tuple(sorted(params.items())))
+
+    @staticmethod
+    def __normalize(args):
+        # SetCenter(1, 2, 3) and SetCenter((1, 2, 3)) are the same call.
+        if len(args) == 1 and isinstance(args[0], (list, tuple)):
+            args = args[0]
+        return tuple(args)
+
+    def __default(self, name):
+        default = _defaults.get(self.source_type)
+        if default is None:
+            default = _defaults[self.source_type] = self.source_type()
+        if not name.startswith('Set'):
+            return None
+        getter = getattr(default, 'Get' + name[3:], None)
+        if getter is None:
+            return None
+        try:
+            value = getter()
+        except TypeError:
+            return None
+        if isinstance(value, (list, tuple)):
+            return self.__normalize((value,))
+        return (value,)
+
+
 class SimpleGeometry(GeometryBase):
     """
     Base class for DICE wrappers over VTK geometry objects.
+
+    With shared=True and a source class, objects with equal source
+    parameters share one source, so its output is computed and stored once.
+    Mappers stay per object, like the actor state. Source parameters of
+    shared objects have to be changed by set_source_param, which moves the
+    object to another shared source.
+
+    With lod=True the scene shows decimated levels of large meshes while the
+    camera moves, see dice_vtk.lod. lod='quadric' uses vtkQuadricLODActor.
     """
     def __init__(self, name, source=None,
             lod=False,
             color=(1.0, 1.0, 1.0),
+            mapper=None,
+            shared=False,
             **kwargs):
         super().__init__(name=name, **kwargs)
 
         self.__filter = None
-        self.__mapper = vtkPolyDataMapper()
+        self.__shares = shared
+        self.__shared = None
+        self.__own_mapper = mapper
+        self.__mapper = None
+        self.__lod = lod is True
 
-        if lod:
+        if lod == 'quadric':
             self.__actor = vtkQuadricLODActor()
         else:
             self.__actor = vtkActor()
@@ -45,13 +136,31 @@ class SimpleGeometry(GeometryBase):
         self.__actor.GetProperty().SetDiffuse(0.8)
         self.__actor.GetProperty().SetSpecular(0.0)
 
-        self.__actor.SetMapper(self.__mapper)
-
         self.color=color
         wizard.subscribe(self.w_scene_actor_clicked, actor=self.__actor)
         self.source = source
 
+    def __use_shared(self, entry):
+        self.__shared = entry
+        self.__source = entry.source
+        self.__filter = None
+        if self.__own_mapper is None:
+            self.__own_mapper = vtkPolyDataMapper()
+        if self.__mapper is not self.__own_mapper:
+            self.__mapper = self.__own_mapper
+            self.__actor.SetMapper(self.__mapper)
+        self.__mapper.SetInputConnection(entry.source.GetOutputPort())
+
     def __set_source(self, source):
+        if source and self.__shares and isinstance(source, type):
+            self.__use_shared(SharedSource.get(source))
+            return
+        self.__shared = None
+        if self.__own_mapper is None:
+            self.__own_mapper = vtkPolyDataMapper()
+        if self.__mapper is not self.__own_mapper:
+            self.__mapper = self.__own_mapper
+            self.__actor.SetMapper(self.__mapper)
         if source:
             if isinstance(source, type):
                 self.__source = source()
@@ -92,6 +201,16 @@ class SimpleGeometry(GeometryBase):
     def w_scene_actor_clicked(self, actor, x, y, control_modifier):
         wizard.w_geometry_object_clicked(self, x, y, control_modifier)
 
+    def set_source_param(self, name, *args):
+        """
+        Calls source setter name with args. A shared source is left unchanged,
+        the object is moved to the shared source with the changed parameter.
+        """
+        if self.__shared is None:
+            getattr(self.__source, name)(*args)
+        else:
+            self.__use_shared(self.__shared.derive(name, args))
+
     def get_sources(self):
         if self.__source:
             return (self.__source,)
@@ -108,6 +227,10 @@ class SimpleGeometry(GeometryBase):
     def mapper(self):
         return self.__mapper
 
+    @property
+    def lod(self):
+        return self.__lod
+
     @GeometryProperty
     def source(self):
         return self.__source
@@ -20,7 +20,7 @@ class Sphere(SimpleGeometry):
 
     @radius.setter
     def radius(self, value):
-        self.source.SetRadius(value)
+        self.set_source_param('SetRadius', value)
 
     @GeometryProperty
     def start_phi(self):
@@ -28,7 +28,7 @@ class Sphere(SimpleGeometry):
 
     @start_phi.setter
     def start_phi(self, value):
-        self.source.SetStartPhi(value)
+        self.set_source_param('SetStartPhi', value)
 
     @GeometryProperty
     def end_phi(self):
@@ -36,7 +36,7 @@ class Sphere(SimpleGeometry):
 
     @end_phi.setter
     def end_phi(self, value):
-        self.source.SetEndPhi(value)
+        self.set_source_param('SetEndPhi', value)
 
     @GeometryProperty
     def phi_resolution(self):
@@ -44,7 +44,7 @@ class Sphere(SimpleGeometry):
 
     @phi_resolution.setter
     def phi_resolution(self, value):
-        self.source.GetPhiResolution(value)
+        self.set_source_param('SetPhiResolution', value)
 
     @GeometryProperty
     def start_theta(self):
@@ -52,7 +52,7 @@ class Sphere(SimpleGeometry):
 
     @start_theta.setter
     def start_theta(self, value):
-        self.source.SetStartTheta(value)
+        self.set_source_param('SetStartTheta', value)
 
     @GeometryProperty
     def end_theta(self):
@@ -60,7 +60,7 @@ class Sphere(SimpleGeometry):
 
     @end_theta.setter
     def end_theta(self, value):
-        self.source.SetEndTheta(value)
+        self.set_source_param('SetEndTheta', value)
 
     @GeometryProperty
     def theta_resolution(self):
@@ -68,4 +68,4 @@ class Sphere(SimpleGeometry):
 
     @theta_resolution.setter
     def theta_resolution(self, value):
-        self.source.SetThetaResolution(value)
+        self.set_source_param('SetThetaResolution', value)
@@ -25,6 +25,7 @@ class TransformGismo(BasicInteractor):
 
         wizard.subscribe(self, scene)
         wizard.subscribe(self.w_property_changed)
+        wizard.subscribe(self.w_geometry_batch_changed)
 
         self.__sources = []
         self.__mappers = []
@@ -46,6 +47,7 @@ class TransformGismo(BasicInteractor):
             actor.SetOrientation(orientation[i])
             actor.GetProperty().SetColor(colors[i])
             self.overlay.AddActor(actor)
+            scene.handle_scaler.add(actor, 0.2)
             wizard.subscribe(self, actor)
             actor.VisibilityOff()
 
@@ -72,20 +74,8 @@ class TransformGismo(BasicInteractor):
             vtkMath.Add(self.targets_pos[t], delta, new_pos)
             t.position = new_pos
 
-    def w_scene_camera_updated(self, scene, *args, **kwargs):
-        size = self.__actors[0].GetXRange()
-        apos = self.__actors[0].GetPosition()
-        self.renderer.SetWorldPoint(*apos, 1)
-        self.renderer.WorldToView()
-        pt = (vtk_mutable(0),vtk_mutable(0))
-        pt = self.renderer.GetViewPoint()
-        pos = (pt[0] + 0.2, pt[1], pt[2])
-        self.renderer.SetViewPoint(*pos)
-        self.renderer.ViewToWorld()
-        zpos = self.renderer.GetWorldPoint()
-        scale = math.sqrt(vtkMath.Distance2BetweenPoints(apos, zpos[:3]))
-        for v in self.__actors:
-            v.SetScale(scale, scale, scale)
+    def rescale(self):
+        self.scene.handle_scaler.update(self.__actors)
 
     def w_scene_object_selection_state(self, scene, obj, enabled):
         if enabled:
@@ -102,6 +92,7 @@ class TransformGismo(BasicInteractor):
             for v in self.__actors:
                 v.SetPosition(pos)
                 v.VisibilityOn()
+            self.rescale()
         else:
             for v in self.__actors:
                 v.VisibilityOff()
@@ -110,6 +101,15 @@ class TransformGismo(BasicInteractor):
         if self.__targets and self.__targets[0] == obj and name == 'position':
             for v in self.__actors:
                 v.SetPosition(value)
+            self.rescale()
+
+    def w_geometry_batch_changed(self, changes):
+        if self.__targets:
+            value = changes.get(self.__targets[0], {}).get('position')
+            if value is not None:
+                for v in self.__actors:
+                    v.SetPosition(value)
+                self.rescale()
 
     def mouse_release(self, btn, x, y, modifiers):
         self.scene.pop_interactor()
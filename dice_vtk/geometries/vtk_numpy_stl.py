@@ -1,3 +1,7 @@
+# Standard Python modules
+# =======================
+import os
+
 # External modules
 # ================
 from vtk import vtkPolyData, vtkPoints, vtkCellArray
@@ -9,33 +13,155 @@ from vtk import vtkAppendPolyData
 # DICE modules
 # ============
 from .simple_geometry import SimpleGeometry
+from ..utils.stl_reader import read_stl
+
+
+def weld_vertices(verts, tolerance=1e-6, bounds=None):
+    """
+    Merges coinciding corners of a triangle soup into shared vertices.
+
+    Corners are compared by coordinates quantized to tolerance times the
+    bounding box diagonal, exactly when tolerance is 0. Quantized corners
+    are packed into one int64 key per corner, axis by axis, so unique sorts
+    a flat array and no (n, 3) temporaries are made.
+
+    :param verts: Array (n, 3) of triangle corners.
+    :param bounds: Bounds of verts when known, spares a pass over them.
+    :return: Tuple (points, indices), float32 array (m, 3) of vertices and
+    int32 (int64 for huge meshes) array (n,) of corner vertices.
+    """
+    verts = np.asarray(verts).reshape((-1, 3))
+    if len(verts) == 0:
+        return np.empty((0, 3), np.float32), np.empty(0, np.int32)
+    if bounds is None:
+        lo = verts.min(axis=0)
+        hi = verts.max(axis=0)
+    else:
+        lo = np.array(bounds[0::2], verts.dtype)
+        hi = np.array(bounds[1::2], verts.dtype)
+    diagonal = float(np.linalg.norm(hi - lo))
+    keys = None
+    if tolerance and diagonal > 0:
+        step = tolerance * diagonal
+        extents = [int(np.rint((h - l) / step)) + 1 for l, h in zip(lo, hi)]
+        if extents[0] * extents[1] * extents[2] < 2 ** 63:
+            keys = np.zeros(len(verts), np.int64)
+            for i in range(3):
+                column = np.rint((verts[:, i] - lo[i]) / step)
+                keys *= extents[i]
+                keys += column.astype(np.int64)
+                del column
+    if keys is None:
+        # Exact or too fine, rows are compared as bytes. Adding 0 turns
+        # -0.0 into 0.0, so both compare equal.
+        keys = verts.astype(np.float32) + np.float32(0)
+        keys = np.ascontiguousarray(keys).view(
+            np.dtype((np.void, keys.dtype.itemsize * 3))).ravel()
+    unique, first, inverse = np.unique(keys, return_index=True,
+                                       return_inverse=True)
+    del unique, keys
+    points = verts[first].astype(np.float32)
+    index_type = np.int32 if len(points) < 2 ** 31 else np.int64
+    return points, inverse.reshape(-1).astype(index_type)
+
+
+def vertex_normals(points, indices):
+    """
+    Returns area weighted unit normals (m, 3) of vertices of triangles
+    given by corner indices.
+    """
+    tris = indices.reshape((-1, 3))
+    a = points[tris[:, 0]]
+    faces = np.cross(points[tris[:, 1]] - a, points[tris[:, 2]] - a)
+    del a
+    normals = np.empty(points.shape, np.float32)
+    corners = tris.reshape(-1)
+    for i in range(3):
+        normals[:, i] = np.bincount(corners,
+                                    weights=np.repeat(faces[:, i], 3),
+                                    minlength=len(points))
+    length = np.linalg.norm(normals, axis=1)
+    length[length == 0] = 1
+    normals /= length[:, None]
+    return normals
+
 
 class VtkNumpySTL(SimpleGeometry):
+    """
+    Triangle soup given as numpy array of triangle corners.
+
+    With weld=True coinciding corners are merged into shared float32
+    vertices, see weld_vertices, which cuts point memory by about twelve for
+    closed meshes. With normals=True smooth vertex normals are added.
+    """
 
-    def __init__(self, data, name='VtkNumpySTL', **kwargs):
-        super().__init__(name=name, lod=True, **kwargs)
+    def __init__(self, data, name='VtkNumpySTL', lod=True,
+                 weld=False, tolerance=1e-6, normals=False, bounds=None,
+                 **kwargs):
+        """
+        :param data: Array of triangle corners, reshaped to (n, 3).
+        :param weld: Merge coinciding corners.
+        :param tolerance: Weld tolerance relative to the bounding box
+        diagonal, 0 for exact matches.
+        :param normals: Compute area weighted vertex normals.
+        :param bounds: Bounds of data when known, used by weld.
+        """
+        super().__init__(name=name, lod=lod, **kwargs)
 
-        self.__verts = data.reshape((-1, 3))
-        self.__tris = np.insert(
-                np.arange(len(self.__verts)
-                    , dtype = 'i8').reshape((-1,3)), 0, 3, axis=1
-            ).reshape(-1)
+        verts = np.asarray(data).reshape((-1, 3))
+        if weld:
+            self.__verts, self.__indices = weld_vertices(verts, tolerance,
+                                                         bounds)
+        else:
+            self.__verts = verts
+            index_type = np.int32 if len(verts) < 2 ** 31 else np.int64
+            self.__indices = np.arange(len(verts), dtype=index_type)
 
         points = vtkPoints()
         points.SetData(numpy_to_vtk(self.__verts))
-        
-        cells = vtkCellArray()
 
-        cells.SetCells(int(len(self.__tris) / 4),
-            numpy_to_vtkIdTypeArray(self.__tris))
+        cells = vtkCellArray()
+        if hasattr(cells, 'GetOffsetsArray'):
+            # Offsets and connectivity are used by VTK as they are.
+            self.__offsets = np.arange(0, len(self.__indices) + 1, 3,
+                                       dtype=self.__indices.dtype)
+            if self.__indices.dtype == np.int32:
+                to_vtk = numpy_to_vtk
+            else:
+                to_vtk = numpy_to_vtkIdTypeArray
+            cells.SetData(to_vtk(self.__offsets), to_vtk(self.__indices))
+        else:
+            self.__tris = np.insert(
+                    self.__indices.astype('i8').reshape((-1, 3)), 0, 3,
+                    axis=1).reshape(-1)
+            cells.SetCells(int(len(self.__tris) / 4),
+                numpy_to_vtkIdTypeArray(self.__tris))
 
         poly = vtkPolyData()
         poly.SetPoints(points)
         poly.SetPolys(cells)
 
-
-        self.actor.GetProperty().SetInterpolationToFlat()
+        if normals:
+            self.__normals = vertex_normals(self.__verts, self.__indices)
+            array = numpy_to_vtk(self.__normals)
+            array.SetName('Normals')
+            poly.GetPointData().SetNormals(array)
+            self.actor.GetProperty().SetInterpolationToGouraud()
+        else:
+            self.actor.GetProperty().SetInterpolationToFlat()
         source=vtkAppendPolyData()
         source.AddInputData(poly)
         self.source = source
-        
\ No newline at end of file
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """
+        Creates geometry from binary STL file, see read_stl. Corners are
+        wrapped by VTK points without another copy unless welded.
+
+        :param path: Path to binary STL file.
+        :param kwargs: Arguments of VtkNumpySTL.
+        """
+        corners, bounds = read_stl(path)
+        kwargs.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+        return cls(corners, bounds=bounds, **kwargs)
@@ -0,0 +1,94 @@
+# Standard Python modules
+# =======================
+
+# External modules
+# ================
+import numpy as np
+
+# DICE modules
+# ============
+from dice_tools import wizard
+
+
+class HandleScaler:
+    """
+    Keeps handle actors of a scene at a constant size on screen.
+
+    Every handle is scaled to the world length which spans offset in view
+    coordinates (the view is 2 units wide) at the handle position, limited
+    by an optional maximal scale. Scales of all handles are computed in one
+    pass from the composite projection matrix of the camera whenever the
+    camera changes, or on update for handles which were moved.
+    """
+
+    def __init__(self, scene):
+        self.__scene = scene
+        self.__renderer = scene.renderer
+        self.__handles = {}
+        wizard.subscribe(self, scene)
+
+    def w_scene_camera_updated(self, scene, *args, **kwargs):
+        self.update()
+
+    def add(self, actor, offset, limit=None):
+        """
+        Adds handle or changes its parameters.
+
+        :param actor: Handle actor.
+        :param offset: Size of handle in view coordinates.
+        :param limit: Maximal scale of handle, unlimited when None.
+        """
+        self.__handles[actor] = [offset, np.inf if limit is None else limit]
+
+    def set_limit(self, actor, limit):
+        """
+        Changes maximal scale of handle, None removes the limit.
+        """
+        self.__handles[actor][1] = np.inf if limit is None else limit
+
+    def remove(self, actor):
+        self.__handles.pop(actor, None)
+
+    def __contains__(self, actor):
+        return actor in self.__handles
+
+    def scales(self, positions, offsets):
+        """
+        Computes world lengths spanning offsets in view coordinates at world
+        positions.
+
+        :param positions: Array of shape (n, 3).
+        :param offsets: Array of shape (n,).
+        :return: Array of shape (n,).
+        """
+        camera = self.__renderer.GetActiveCamera()
+        matrix = camera.GetCompositeProjectionTransformMatrix(
+            self.__renderer.GetTiledAspectRatio(), 0, 1)
+        m = np.array([[matrix.GetElement(i, j) for j in range(4)]
+                      for i in range(4)])
+        points = np.c_[positions, np.ones(len(positions))]
+        view = points.dot(m.T)
+        view /= view[:, 3:4]
+        view[:, 0] += offsets
+        world = view.dot(np.linalg.inv(m).T)
+        world = world[:, :3] / world[:, 3:4]
+        return np.linalg.norm(world - positions, axis=1)
+
+    def update(self, actors=None):
+        """
+        Rescales handles.
+
+        :param actors: Handles to rescale, all by default.
+        """
+        if actors is None:
+            actors = list(self.__handles)
+        else:
+            actors = [v for v in actors if v in self.__handles]
+        if not actors:
+            return
+        positions = np.array([v.GetPosition() for v in actors])
+        params = np.array([self.__handles[v] for v in actors])
+        scales = np.minimum(self.scales(positions, params[:, 0]),
+                            params[:, 1])
+        for actor, scale in zip(actors, scales.tolist()):
+            actor.SetScale(scale, scale, scale)
@@ -4,6 +4,7 @@ from vtk import vtkMath
 from vtk import vtkInteractorStyleSwitch
 
 from dice_tools import wizard
+from dice_vtk.picking import LocatorPicker, HoverProbe
 import math
 
 class BasicInteractor:
@@ -49,6 +50,19 @@ class BasicInteractor:
 
 
 class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
+    """
+    Passes mouse and key events of a scene to VTK.
+
+    Mouse moves and wheel turns are coalesced per rendered frame: while the
+    camera is manipulated they only request a frame and the latest move
+    and the summed wheel delta are handed to VTK right before it, see
+    flush_events. Moves without camera interaction are handed over on the
+    next tick, as they render nothing by themselves.
+    """
+
+    # Wheel delta of one notch, Qt reports eighths of a degree.
+    wheel_step = 120.0
+
     def __init__(self, scene):
         super().__init__()
         self.scene = scene
@@ -62,30 +76,111 @@ class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
         self.SetRenderWindow(scene.render_window)
         self.SetInteractorStyle(self.style)
 
-        self.picker = self.GetPicker()
+        self.__move = None
+        self.__wheel = None
+        self.__wheel_delta = 0.0
+        self.__flush_scheduled = False
+
+        self.picker = LocatorPicker()
+        self.hover_probe = HoverProbe(scene, self.picker)
         self.ex, self.ey = (-1, -1)
         self.pick = 0
 
         self.AddObserver(vtkCommand.RenderEvent, self.render)
+        scene.scheduler.frame_callbacks.append(self.flush_events)
+        wizard.subscribe(self, scene)
+
+    def w_scene_object_removed(self, scene, obj):
+        # Widgets like AxesWidget only implement attach and detach.
+        for actor in getattr(obj, 'get_actors', tuple)():
+            self.picker.forget(actor)
+
+    def pick_actor(self, x, y):
+        """
+        Picks actor at display point x, y, overlay first.
+
+        :return: True when an actor was hit, see picker attributes.
+        """
+        self.scene.render_window.activate()
+        result = self.picker.pick(float(x), float(y), self.overlay)
+        if not result:
+            result = self.picker.pick(float(x), float(y), self.renderer)
+        if result:
+            wizard.w_scene_actor_picked(self.picker.actor,
+                                        self.picker.cell_id,
+                                        self.picker.position)
+        return result
 
     def render(self, obj, ev):
         self.scene.render(False)
 
     def enable(self):
-        self.SetSize(self.scene.render_window.GetSize())
+        self.SetSize(self.scene.render_window.render_size())
         self.Enable()
 
     def set_size(self, x, y):
         self.SetSize(x, y)
 
     def disable(self):
+        self.__move = None
+        self.__wheel = None
+        self.__wheel_delta = 0.0
         self.Disable()
 
+    def __schedule_flush(self):
+        if self.style.GetCurrentStyle().GetState() or self.__wheel:
+            # The camera moves, events are flushed by the frame they cause.
+            self.scene.render(False)
+        elif not self.__flush_scheduled:
+            self.__flush_scheduled = True
+            wizard.timeout(self.flush_events, 0)
+
+    def flush_events(self):
+        """
+        Processes coalesced mouse move and wheel events. Only the latest move
+        since the previous flush is passed to VTK, wheel deltas are summed
+        up and applied as one step scaled by the number of notches they
+        make. Called by the scene scheduler right before every frame, so
+        the frame shows the result.
+        """
+        self.__flush_scheduled = False
+        move, self.__move = self.__move, None
+        if move:
+            x, y, modifiers = move
+            self.SetEventInformation(x, y,
+                                     modifiers & self.ControlModifier,
+                                     modifiers & self.ShiftModifier)
+            self.SetAltKey(modifiers & self.AltModifier)
+            self.InvokeEvent(vtkCommand.MouseMoveEvent)
+            if not self.style.GetCurrentStyle().GetState():
+                self.hover_probe.move(x, y)
+
+        wheel, self.__wheel = self.__wheel, None
+        delta, self.__wheel_delta = self.__wheel_delta, 0.0
+        if wheel and delta:
+            x, y, modifiers = wheel
+            self.SetEventInformation(x, y,
+                                     modifiers & self.ControlModifier,
+                                     modifiers & self.ShiftModifier)
+            self.SetAltKey(modifiers & self.AltModifier)
+            style = self.style.GetCurrentStyle()
+            factor = style.GetMouseWheelMotionFactor()
+            style.SetMouseWheelMotionFactor(
+                factor * abs(delta) / self.wheel_step)
+            try:
+                if delta > 0:
+                    self.InvokeEvent(vtkCommand.MouseWheelForwardEvent)
+                else:
+                    self.InvokeEvent(vtkCommand.MouseWheelBackwardEvent)
+            finally:
+                style.SetMouseWheelMotionFactor(factor)
+
     def InvokeEvent(self, evt):
         if self.GetEnabled():
             vtkGenericRenderWindowInteractor.InvokeEvent(self, evt)
 
     def mouse_press(self, btn, x, y, modifiers):
+        self.flush_events()
         self.SetEventInformation(x, y,
                                  modifiers & self.ControlModifier,
                                  modifiers & self.ShiftModifier)
@@ -94,13 +189,8 @@ class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
         if btn == self.LeftButton:
             self.ex, self.ey = self.GetEventPosition()
             ex, ey = self.GetEventPosition()
-            self.scene.render_window.activate()
-            result = self.picker.Pick(float(ex), float(ey), 0.0, self.overlay)
-            if result == 0:
-                result = self.picker.Pick(float(ex), float(ey), 0.0, self.renderer)
-
-            if result != 0:
-                actor = self.picker.GetActor()
+            if self.pick_actor(ex, ey):
+                actor = self.picker.actor
                 wizard.w_scene_actor_pressed(actor, ex, ey,
                     control_modifier = modifiers & self.ControlModifier == 0)
 
@@ -111,6 +201,7 @@ class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
             self.InvokeEvent(vtkCommand.MiddleButtonPressEvent)
 
     def mouse_release(self, btn, x, y, modifiers):
+        self.flush_events()
         self.SetEventInformation(x, y,
                                  modifiers & self.ControlModifier,
                                  modifiers & self.ShiftModifier)
@@ -121,18 +212,13 @@ class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
             delta = vtkMath.Distance2BetweenPoints(
                 (self.ex, self.ey, 0), (ex, ey, 0))
             if delta < 5:
-                self.scene.render_window.activate()
-                result = self.picker.Pick(float(ex), float(ey), 0.0, self.overlay)
-                if result == 0:
-                    result = self.picker.Pick(float(ex), float(ey), 0.0, self.renderer)
-
-                if result == 0:
+                if not self.pick_actor(ex, ey):
                     wizard.w_scene_actor_clicked(None, ex, ey,
                         control_modifier = modifiers & self.ControlModifier == 0)
                     wizard.w_geometry_object_clicked(None,
                         control_modifier = modifiers & self.ControlModifier == 0)
                 else:
-                    actor = self.picker.GetActor()
+                    actor = self.picker.actor
                     wizard.w_scene_actor_clicked(actor, ex, ey,
                         control_modifier = modifiers & self.ControlModifier == 0)
                     geometry_object = getattr(actor, 'geometry_object', None)
@@ -147,13 +233,11 @@ class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
             self.InvokeEvent(vtkCommand.MiddleButtonReleaseEvent)
 
     def mouse_move(self, x, y, modifiers):
-        self.SetEventInformation(x, y,
-                                      modifiers & self.ControlModifier,
-                                      modifiers & self.ShiftModifier)
-        self.SetAltKey(modifiers & self.AltModifier)
-        self.InvokeEvent(vtkCommand.MouseMoveEvent)
+        self.__move = (x, y, modifiers)
+        self.__schedule_flush()
 
     def key_press(self, key, x, y, modifiers):
+        self.flush_events()
         self.SetEventInformation(x, y,
                                  ctrl=(modifiers & self.ControlModifier),
                                  shift=(modifiers & self.ShiftModifier),
@@ -164,6 +248,7 @@ class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
         self.InvokeEvent(vtkCommand.CharEvent)
 
     def key_release(self, key, x, y, modifiers):
+        self.flush_events()
         self.SetEventInformation(x, y,
                                  modifiers & self.ControlModifier,
                                  modifiers & self.ShiftModifier,
@@ -172,11 +257,8 @@ class Interactor(vtkGenericRenderWindowInteractor, BasicInteractor):
         self.InvokeEvent(vtkCommand.KeyReleaseEvent)
 
     def wheel(self, delta_x, delta_y, x, y, modifiers):
-        self.SetEventInformation(x, y,
-                                 modifiers & self.ControlModifier,
-                                 modifiers & self.ShiftModifier)
-        self.SetAltKey(modifiers & self.AltModifier)
-        if delta_y > 0:
-            self.InvokeEvent(vtkCommand.MouseWheelForwardEvent)
-        else:
-            self.InvokeEvent(vtkCommand.MouseWheelBackwardEvent)
+        if self.__move:
+            self.flush_events()
+        self.__wheel = (x, y, modifiers)
+        self.__wheel_delta += delta_y
+        self.__schedule_flush()
@@ -0,0 +1,395 @@
+# Standard Python modules
+# =======================
+import hashlib
+import math
+import os
+import traceback
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# External modules
+# ================
+from vtk import vtkCubeSource
+from vtk import vtkPolyData
+from vtk import vtkPolyDataMapper
+from vtk import vtkQuadricDecimation
+from vtk import vtkTriangleFilter
+from vtk import vtkXMLPolyDataReader
+from vtk import vtkXMLPolyDataWriter
+from vtk.util.numpy_support import vtk_to_numpy
+
+# DICE modules
+# ============
+from dice_tools import wizard
+
+
+# Built pyramids of geometry objects, shared by scenes.
+_pyramids = weakref.WeakKeyDictionary()
+
+
+class LODPyramid:
+    """
+    Levels of detail of a polygonal mesh.
+
+    Level 0 is the mesh itself, the following levels keep fractions of its
+    triangles and the last level is a box proxy of its bounds. Levels are
+    built from a shallow copy of the mesh taken on construction, which keeps
+    its arrays alive when the mesh is given new ones, so build may run in a
+    worker thread while the original is replaced. Built levels are stored in
+    cache_dir as VTP files named by a digest of the mesh, a pyramid of the
+    same mesh is loaded from there instead of being decimated again.
+    Persistence is disabled when cache_dir is None.
+    """
+
+    fractions = (0.25, 0.05)
+    cache_dir = os.path.join(os.path.expanduser('~'), '.cache',
+                             'dice_vtk', 'lod')
+
+    def __init__(self, data):
+        """
+        :param data: vtkPolyData of level 0.
+        """
+        self.data = data
+        self.mtime = data.GetMTime()
+        self.levels = None
+        self.triangles = None
+        self.__snapshot = vtkPolyData()
+        self.__snapshot.ShallowCopy(data)
+
+    @staticmethod
+    def digest(data):
+        """
+        Returns hex digest of points, cells and point data of data.
+        """
+        sha = hashlib.sha1()
+        arrays = [data.GetPoints().GetData()] if data.GetPoints() else []
+        arrays.extend(v.GetData() for v in (data.GetVerts(), data.GetLines(),
+                                            data.GetPolys(),
+                                            data.GetStrips()))
+        point_data = data.GetPointData()
+        for i in range(point_data.GetNumberOfArrays()):
+            array = point_data.GetArray(i)
+            if array is not None:
+                sha.update(str(array.GetName()).encode())
+                arrays.append(array)
+        for array in arrays:
+            sha.update(vtk_to_numpy(array).tobytes())
+        return sha.hexdigest()
+
+    def build(self):
+        """
+        Loads levels from cache or decimates the mesh and stores them.
+        """
+        data = self.__snapshot
+        name = self.digest(data) if self.cache_dir else None
+        levels = self.__load(name) if name else None
+        if levels is None:
+            levels = self.__decimate(data)
+            if name:
+                self.__store(name, levels)
+        cube = vtkCubeSource()
+        cube.SetBounds(data.GetBounds())
+        cube.Update()
+        levels.append(cube.GetOutput())
+        self.triangles = ([data.GetNumberOfCells()]
+                          + [v.GetNumberOfCells() for v in levels])
+        self.levels = [self.data] + levels
+        self.__snapshot = None
+
+    def __decimate(self, data):
+        triangles = vtkTriangleFilter()
+        triangles.SetInputData(data)
+        triangles.PassVertsOff()
+        triangles.PassLinesOff()
+        triangles.Update()
+        source = triangles.GetOutput()
+        count = source.GetNumberOfCells()
+        levels = []
+        for fraction in self.fractions:
+            current = max(source.GetNumberOfCells(), 1)
+            decimate = vtkQuadricDecimation()
+            decimate.SetInputData(source)
+            decimate.SetTargetReduction(
+                min(max(1.0 - fraction * count / current, 0.0), 0.99))
+            if hasattr(decimate, 'MapPointDataOn'):
+                decimate.MapPointDataOn()
+            decimate.Update()
+            source = decimate.GetOutput()
+            levels.append(source)
+        return levels
+
+    def __path(self, name, level):
+        return os.path.join(self.cache_dir, '{}_{}.vtp'.format(name, level))
+
+    def __load(self, name):
+        levels = []
+        for i in range(1, len(self.fractions) + 1):
+            path = self.__path(name, i)
+            if not os.path.isfile(path):
+                return None
+            reader = vtkXMLPolyDataReader()
+            reader.SetFileName(path)
+            reader.Update()
+            levels.append(reader.GetOutput())
+        return levels
+
+    def __store(self, name, levels):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for i, level in enumerate(levels, 1):
+                path = self.__path(name, i)
+                # Readers never see partially written files.
+                temp = '{}.{}.tmp'.format(path, os.getpid())
+                writer = vtkXMLPolyDataWriter()
+                writer.SetFileName(temp)
+                writer.SetInputData(level)
+                writer.SetDataModeToAppended()
+                if writer.Write():
+                    os.replace(temp, path)
+        except OSError:
+            traceback.print_exc()
+
+
+class LODController:
+    """
+    Chooses pyramid levels for geometry objects of a scene.
+
+    Objects with lod enabled are managed when their mesh has at least
+    min_triangles cells. Their pyramids are built in a worker thread after
+    the camera settles and whenever the mesh changed. On every camera update
+    levels are assigned greedily: all objects start at the box proxy and, in
+    the order of their apparent size, are refined to the finest level which
+    keeps the estimated triangle count of the frame within the frame time
+    budget. Time per triangle is estimated from the previous frames. When
+    the camera settles all objects return to level 0.
+
+    Actors of geometry objects are shared by all scenes showing them, so
+    levels are kept per controller and put on the actors by apply right
+    before the scene is drawn.
+    """
+
+    min_triangles = 20000
+    poll_interval = 50
+
+    def __init__(self, scene):
+        self.__scene = scene
+        self.__objects = {}
+        self.__levels = {}
+        self.__mappers = {}
+        self.__synced = {}
+        self.__builds = {}
+        self.__executor = None
+        self.__triangles = 0
+        self.budget = None
+        self.triangle_cost = 1e-8
+        wizard.subscribe(self, scene)
+
+    @property
+    def frame_budget(self):
+        """
+        Frame time in seconds levels are chosen for, the scheduler frame
+        interval unless budget is set. None when there is no budget, i.e.
+        the frame rate of the scene is not capped.
+        """
+        return self.budget or self.__scene.scheduler.frame_interval or None
+
+    def w_scene_object_added(self, scene, obj):
+        if getattr(obj, 'lod', False) is True:
+            self.__objects[obj] = None
+
+    def w_scene_object_removed(self, scene, obj):
+        if obj in self.__objects:
+            self.set_level(obj, 0)
+            self.__show(obj, obj.mapper)
+            del self.__objects[obj]
+            self.__mappers.pop(obj, None)
+            self.__synced.pop(obj, None)
+            self.__builds.pop(obj, None)
+
+    def w_scene_camera_updated(self, scene, *args, **kwargs):
+        self.choose()
+
+    def w_scene_camera_settled(self, scene, *args, **kwargs):
+        self.restore()
+        self.build()
+
+    def level(self, obj):
+        return self.__levels.get(obj, 0)
+
+    def pyramid(self, obj):
+        """
+        Returns built pyramid of the current mesh of obj or None.
+        """
+        pyramid = _pyramids.get(obj)
+        if pyramid is None:
+            return None
+        data = obj.mapper.GetInput()
+        if pyramid.data is not data or pyramid.mtime != data.GetMTime():
+            return None
+        return pyramid
+
+    def set_level(self, obj, level):
+        """
+        Selects level of obj pyramid for this scene, 0 selects the mesh
+        itself. The level is shown by the next apply.
+        """
+        if level == 0:
+            self.__levels.pop(obj, None)
+            return
+        pyramid = self.pyramid(obj)
+        if pyramid is None:
+            return self.set_level(obj, 0)
+        mappers = self.__mappers.get(obj)
+        if mappers is None or mappers[0] is not pyramid:
+            mappers = [pyramid] + [vtkPolyDataMapper()
+                                   for v in pyramid.levels[1:]]
+            self.__mappers[obj] = mappers
+            self.__synced[obj] = {}
+        self.__levels[obj] = level
+
+    def apply(self):
+        """
+        Puts the levels of this scene on the actors. Level mappers take
+        over the coloring of the object mapper whenever its MTime changed.
+        Picking keeps using the mesh itself through the pick_mapper of the
+        actor.
+        """
+        for obj in self.__objects:
+            level = self.__levels.get(obj, 0)
+            if level and self.__mappers[obj][0] is not self.pyramid(obj):
+                # The mesh changed since the level was chosen.
+                del self.__levels[obj]
+                level = 0
+            if level == 0:
+                self.__show(obj, obj.mapper)
+                continue
+            mappers = self.__mappers[obj]
+            mapper = mappers[level]
+            mtime = obj.mapper.GetMTime()
+            synced = self.__synced[obj]
+            if synced.get(level) != mtime:
+                mapper.ShallowCopy(obj.mapper)
+                mapper.SetInputData(mappers[0].levels[level])
+                synced[level] = mtime
+            self.__show(obj, mapper)
+
+    @staticmethod
+    def __show(obj, mapper):
+        actor = obj.actor
+        if actor.GetMapper() is not mapper:
+            actor.SetMapper(mapper)
+        actor.pick_mapper = obj.mapper
+
+    def choose(self):
+        """
+        Assigns levels to objects for the current camera. Without a frame
+        budget all objects stay at level 0.
+        """
+        budget = self.frame_budget
+        if not self.__objects or budget is None:
+            self.__levels.clear()
+            return
+        renderer = self.__scene.renderer
+        if self.__triangles:
+            cost = renderer.GetLastRenderTimeInSeconds() / self.__triangles
+            self.triangle_cost += 0.5 * (cost - self.triangle_cost)
+        limit = budget / max(self.triangle_cost, 1e-12)
+
+        camera = renderer.GetActiveCamera()
+        eye = camera.GetPosition()
+        parallel = camera.GetParallelProjection()
+        total = 0
+        candidates = []
+        for obj in self.__objects:
+            actor = obj.actor
+            if not actor.GetVisibility():
+                continue
+            pyramid = self.pyramid(obj)
+            if pyramid is None:
+                data = obj.mapper.GetInput()
+                total += data.GetNumberOfCells() if data else 0
+                continue
+            bounds = actor.GetBounds()
+            size = math.sqrt(sum((bounds[i + 1] - bounds[i]) ** 2
+                                 for i in range(0, 6, 2)))
+            if not parallel:
+                distance = math.sqrt(sum(
+                    ((bounds[2 * i] + bounds[2 * i + 1]) / 2 - eye[i]) ** 2
+                    for i in range(3)))
+                size /= max(distance, 1e-12)
+            total += pyramid.triangles[-1]
+            candidates.append((size, obj, pyramid))
+
+        candidates.sort(key=lambda v: v[0], reverse=True)
+        for size, obj, pyramid in candidates:
+            coarse = pyramid.triangles[-1]
+            level = len(pyramid.triangles) - 1
+            for i, count in enumerate(pyramid.triangles[:-1]):
+                if total - coarse + count <= limit:
+                    level = i
+                    break
+            total += pyramid.triangles[level] - coarse
+            self.set_level(obj, level)
+        self.__triangles = total
+
+    def restore(self):
+        """
+        Returns all objects to level 0.
+        """
+        self.__triangles = 0
+        if self.__levels:
+            for obj in list(self.__levels):
+                self.set_level(obj, 0)
+            self.__scene.render()
+
+    def build(self):
+        """
+        Starts building pyramids of objects which have none for their
+        current mesh.
+        """
+        for obj in self.__objects:
+            if obj in self.__builds or self.pyramid(obj) is not None:
+                continue
+            data = obj.mapper.GetInput()
+            if (data is None or not data.IsA('vtkPolyData')
+                    or data.GetNumberOfCells() < self.min_triangles):
+                continue
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=1)
+            pyramid = LODPyramid(data)
+            self.__builds[obj] = (pyramid,
+                                  self.__executor.submit(pyramid.build))
+            if len(self.__builds) == 1:
+                wizard.timeout(self.__poll, self.poll_interval)
+
+    def wait(self):
+        """
+        Blocks until running builds finish and takes their pyramids.
+        """
+        wait([v[1] for v in self.__builds.values()])
+        self.__poll()
+
+    def __poll(self):
+        for obj, (pyramid, future) in list(self.__builds.items()):
+            if not future.done():
+                continue
+            del self.__builds[obj]
+            try:
+                future.result()
+            except Exception:
+                traceback.print_exc()
+                continue
+            _pyramids[obj] = pyramid
+        if self.__builds:
+            wizard.timeout(self.__poll, self.poll_interval)
+
+    def shutdown(self):
+        """
+        Restores all objects and stops the worker.
+        """
+        self.__levels.clear()
+        self.apply()
+        self.__builds.clear()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
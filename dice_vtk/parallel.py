@@ -0,0 +1,157 @@
+# Standard Python modules
+# =======================
+import itertools
+import traceback
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# External modules
+# ================
+
+# DICE modules
+# ============
+from dice_tools import wizard
+from dice_vtk.scene import RenderWindowProxy
+
+
+class ParallelRenderer:
+    """
+    Renders dirty scenes concurrently, each one in its own offscreen window.
+
+    Render requests of scenes using this backend are collected during a tick
+    and rendered together on the next one. Camera updates and window
+    activation of all dirty scenes run on the calling thread first, with the
+    window pool raised to hold all of them, so no window is evicted while
+    it is drawn. Then every scene is drawn on a worker thread and its frame
+    is read back through the scene readback on the calling thread. A scene
+    always goes to the same worker, and every thread releases the OpenGL
+    context of a window when it is done with it, so the context is current
+    in one thread at a time.
+
+    Scenes sharing actors, mappers or mapper inputs, e.g. scenes of one tag
+    in VisApp, are never drawn at the same time, because VTK pipelines and
+    mappers are not thread safe. They are drawn in consecutive waves, each
+    wave concurrently.
+
+    Scenes only render in parallel when the VTK build releases the GIL in
+    Render (VTK_PYTHON_FULL_THREADSAFE) and provides offscreen contexts
+    which can live in separate threads, e.g. OSMesa.
+    """
+
+    def __init__(self, workers=4, pool_size=None):
+        """
+        :param workers: Number of worker threads.
+        :param pool_size: Number of persistent render windows to keep,
+        defaults to workers. RenderWindowProxy.window_pool_size is raised to
+        this value if needed.
+        """
+        if pool_size is None:
+            pool_size = workers
+        RenderWindowProxy.window_pool_size = max(
+            RenderWindowProxy.window_pool_size, pool_size)
+        self.__executors = [ThreadPoolExecutor(max_workers=1)
+                            for i in range(workers)]
+        self.__next_executor = itertools.cycle(self.__executors)
+        self.__assigned = {}
+        self.__dirty = []
+        self.__scheduled = False
+
+    def request(self, scene):
+        """
+        Marks scene to be rendered on the next tick.
+        """
+        if scene not in self.__dirty:
+            self.__dirty.append(scene)
+        if not self.__scheduled:
+            self.__scheduled = True
+            wizard.timeout(self.render_dirty, 0)
+
+    def forget(self, scene):
+        """
+        Drops scene from the backend.
+        """
+        self.__assigned.pop(scene, None)
+        if scene in self.__dirty:
+            self.__dirty.remove(scene)
+
+    def render_dirty(self):
+        """
+        Renders all requested scenes concurrently.
+        """
+        self.__scheduled = False
+        scenes, self.__dirty = self.__dirty, []
+        RenderWindowProxy.window_pool_size = max(
+            RenderWindowProxy.window_pool_size, len(scenes))
+        for scene in scenes:
+            start = perf_counter()
+            scene.update_camera()
+            scene.frame_stats.add('camera', perf_counter() - start)
+            scene.render_window.activate()
+            scene.render_window.release_context()
+        for wave in self.__waves(scenes):
+            futures = []
+            for scene in wave:
+                # Levels of detail are put on actors shared with scenes
+                # of other waves.
+                scene.lod.apply()
+                executor = self.__assigned.get(scene)
+                if executor is None:
+                    executor = next(self.__next_executor)
+                    self.__assigned[scene] = executor
+                futures.append(executor.submit(self.__draw, scene))
+            wait(futures)
+            for scene, future in zip(wave, futures):
+                try:
+                    elapsed = future.result()
+                except Exception:
+                    traceback.print_exc()
+                    continue
+                scene.frame_stats.add('render', elapsed)
+                scene.render_window.read_back()
+
+    @staticmethod
+    def __resources(scene):
+        """
+        Returns addresses of actors, mappers and mapper inputs of scene.
+        """
+        result = set()
+        actors = scene.renderer.GetActors()
+        actors.InitTraversal()
+        actor = actors.GetNextActor()
+        while actor:
+            result.add(actor.__this__)
+            mapper = actor.GetMapper()
+            if mapper:
+                result.add(mapper.__this__)
+                data = mapper.GetInputDataObject(0, 0)
+                if data:
+                    result.add(data.__this__)
+            actor = actors.GetNextActor()
+        return result
+
+    def __waves(self, scenes):
+        """
+        Splits scenes into lists of scenes which share no resources.
+        """
+        waves = []
+        for scene in scenes:
+            resources = self.__resources(scene)
+            for used, wave in waves:
+                if used.isdisjoint(resources):
+                    break
+            else:
+                used, wave = set(), []
+                waves.append((used, wave))
+            used.update(resources)
+            wave.append(scene)
+        return [v[1] for v in waves]
+
+    @staticmethod
+    def __draw(scene):
+        start = perf_counter()
+        scene.render_window.draw()
+        return perf_counter() - start
+
+    def shutdown(self):
+        for v in self.__executors:
+            v.shutdown()
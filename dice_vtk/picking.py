@@ -0,0 +1,456 @@
+# Standard Python modules
+# =======================
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# External modules
+# ================
+from vtk import vtkBox
+from vtk import vtkGenericCell
+from vtk import vtkMatrix4x4
+from vtk import vtkModifiedBSPTree
+from vtk import vtkPropPicker
+from vtk import mutable as vtk_mutable
+from vtk import VTK_GET_ARRAY_BY_NAME
+from vtk import VTK_SCALAR_MODE_USE_POINT_DATA
+from vtk import VTK_SCALAR_MODE_USE_CELL_DATA
+from vtk import VTK_SCALAR_MODE_USE_POINT_FIELD_DATA
+from vtk import VTK_SCALAR_MODE_USE_CELL_FIELD_DATA
+
+# DICE modules
+# ============
+from dice_tools import wizard
+
+
+class LocatorPicker:
+    """
+    Picks actors by intersecting the view ray with cell locators.
+
+    A vtkModifiedBSPTree is built for the mapper input of an actor the first
+    time the actor is hit by its bounds and kept until the input is modified
+    or replaced, so repeated picks on large meshes only walk the tree.
+    Locators are cached per input data set, actors sharing an input share
+    one locator. Actors providing an intersect_with_line(p0, p1) attribute,
+    returning (t, cell id) or None for the segment p0-p1 in world
+    coordinates, are intersected by that instead.
+
+    Picking runs in two steps: targets culls actors and builds locators on
+    the thread owning the pipeline, intersect_targets only walks prebuilt
+    locators and may run in a worker thread.
+
+    Props which have no data set to intersect, e.g. assemblies, volumes or
+    actors of composite data, are picked by a vtkPropPicker in pick, the
+    hit closer to the camera wins. Their cell id is -1.
+    """
+
+    def __init__(self, tolerance=1e-6):
+        """
+        :param tolerance: Intersection tolerance relative to the diagonal of
+        the picked data set.
+        """
+        self.tolerance = tolerance
+        self.__locators = {}
+        self.__inputs = {}
+        self.__lock = threading.Lock()
+        self.__prop_picker = vtkPropPicker()
+        self.actor = None
+        self.cell_id = -1
+        self.position = None
+
+    @staticmethod
+    def mapper(actor):
+        """
+        Returns mapper whose input is picked for actor, its pick_mapper when
+        set, e.g. while a coarser level of detail is shown.
+        """
+        return getattr(actor, 'pick_mapper', None) or actor.GetMapper()
+
+    @staticmethod
+    def ray(renderer, x, y):
+        """
+        Returns end points in world coordinates of the view ray through
+        display point x, y between the near and far clipping planes.
+        """
+        points = []
+        for z in (0.0, 1.0):
+            renderer.SetDisplayPoint(x, y, z)
+            renderer.DisplayToWorld()
+            p = renderer.GetWorldPoint()
+            w = p[3] or 1.0
+            points.append((p[0] / w, p[1] / w, p[2] / w))
+        return points
+
+    @staticmethod
+    def actors(renderer):
+        """
+        Returns visible pickable actors of renderer which are intersected by
+        locators or their own intersect_with_line.
+        """
+        return LocatorPicker.props(renderer)[0]
+
+    @staticmethod
+    def props(renderer):
+        """
+        Returns tuple (actors, others) of visible pickable props of
+        renderer, actors are intersected by locators or their own
+        intersect_with_line, others need a vtkPropPicker.
+        """
+        actors = []
+        others = []
+        props = renderer.GetViewProps()
+        props.InitTraversal()
+        prop = props.GetNextProp()
+        while prop:
+            if prop.GetVisibility() and prop.GetPickable():
+                if LocatorPicker.__intersectable(prop):
+                    actors.append(prop)
+                else:
+                    others.append(prop)
+            prop = props.GetNextProp()
+        return actors, others
+
+    @staticmethod
+    def __intersectable(prop):
+        if not prop.IsA('vtkActor'):
+            return False
+        if getattr(prop, 'intersect_with_line', None):
+            return True
+        mapper = LocatorPicker.mapper(prop)
+        data = mapper.GetInput() if mapper else None
+        return data is not None and data.IsA('vtkDataSet')
+
+    def pick(self, x, y, renderer):
+        """
+        Picks actor of renderer at display point x, y and stores result in
+        actor, cell_id and position attributes.
+
+        :return: True when an actor was hit.
+        """
+        p0, p1 = self.ray(renderer, x, y)
+        actors, others = self.props(renderer)
+        result = self.intersect(actors, p0, p1)
+        if others:
+            other = self.__pick_props(others, x, y, renderer)
+            if other and (result is None
+                          or self.__depth(other[2], p0, p1)
+                          < self.__depth(result[2], p0, p1)):
+                result = other
+        if result:
+            self.actor, self.cell_id, self.position = result
+        else:
+            self.actor, self.cell_id, self.position = None, -1, None
+        return result is not None
+
+    def __pick_props(self, props, x, y, renderer):
+        picker = self.__prop_picker
+        picker.InitializePickList()
+        for prop in props:
+            picker.AddPickList(prop)
+        picker.PickFromListOn()
+        if not picker.Pick(x, y, 0.0, renderer):
+            return None
+        # Parts of assemblies are reported, like by intersected actors.
+        actor = picker.GetActor() or picker.GetViewProp()
+        return actor, -1, tuple(picker.GetPickPosition())
+
+    @staticmethod
+    def __depth(position, p0, p1):
+        d = [b - a for a, b in zip(p0, p1)]
+        return sum((v - a) * w for v, a, w in zip(position, p0, d))
+
+    def targets(self, actors, p0, p1):
+        """
+        Prepares intersection of segment p0-p1 with actors: culls actors by
+        bounds, builds missing locators and intersects actors providing
+        intersect_with_line. Has to run on the thread owning the pipeline.
+
+        :return: List of targets for intersect_targets.
+        """
+        direction = [b - a for a, b in zip(p0, p1)]
+        result = []
+        for actor in actors:
+            coord = [0.0] * 3
+            t = vtk_mutable(0.0)
+            if not vtkBox.IntersectBox(actor.GetBounds(), p0, direction,
+                                       coord, t):
+                continue
+            custom = getattr(actor, 'intersect_with_line', None)
+            if custom:
+                result.append((float(t), actor, None, custom(p0, p1)))
+                continue
+            found = self.__locator(actor)
+            if found is None:
+                continue
+            locator, data = found
+            inverse = vtkMatrix4x4()
+            vtkMatrix4x4.Invert(actor.GetMatrix(), inverse)
+            result.append((float(t), actor,
+                           (locator, inverse,
+                            self.tolerance * data.GetLength()), None))
+        result.sort(key=lambda v: v[0])
+        return result
+
+    def intersect_targets(self, targets, p0, p1):
+        """
+        Intersects segment p0-p1 with targets prepared by targets. Only
+        walks prebuilt locators over snapshots of the picked data sets, so
+        it may run in a worker thread while pipelines execute.
+
+        :return: Tuple (actor, cell id, world position) of the hit closest
+        to p0 or None.
+        """
+        closest = None
+        for t, actor, target, hit in targets:
+            if closest and t > closest[0]:
+                break
+            if target is not None:
+                hit = self.__intersect_locator(target, p0, p1)
+            if hit and (closest is None or hit[0] < closest[0]):
+                closest = (hit[0], actor, hit[1])
+        if closest is None:
+            return None
+        t, actor, cell_id = closest
+        position = tuple(a + t * (b - a) for a, b in zip(p0, p1))
+        return actor, cell_id, position
+
+    def intersect(self, actors, p0, p1):
+        """
+        Intersects segment p0-p1 with actors.
+
+        :return: Tuple (actor, cell id, world position) of the hit closest
+        to p0 or None.
+        """
+        return self.intersect_targets(self.targets(actors, p0, p1), p0, p1)
+
+    def clear(self):
+        """
+        Drops all cached locators.
+        """
+        with self.__lock:
+            self.__locators.clear()
+            self.__inputs.clear()
+
+    def forget(self, actor):
+        """
+        Drops cached locator of actor unless another actor uses its input.
+        """
+        with self.__lock:
+            self.__release(self.__inputs.pop(actor, None))
+
+    def __release(self, key):
+        if key is not None and key not in self.__inputs.values():
+            self.__locators.pop(key, None)
+
+    def __locator(self, actor):
+        mapper = self.mapper(actor)
+        if mapper is None:
+            return None
+        data = mapper.GetInput()
+        if data is None or not data.IsA('vtkDataSet'):
+            return None
+        if data.GetNumberOfCells() == 0:
+            return None
+        # Python wrappers of VTK objects come and go, the address of the
+        # data set is stable while its cache entry holds a reference to it.
+        key = data.__this__
+        mtime = data.GetMTime()
+        with self.__lock:
+            previous = self.__inputs.get(actor)
+            if previous != key:
+                self.__inputs[actor] = key
+                self.__release(previous)
+            entry = self.__locators.get(key)
+            if entry and entry[0] == mtime:
+                return entry[1], data
+            # The locator walks a shallow copy, which keeps the arrays of
+            # this state alive when the pipeline replaces them while a
+            # worker thread intersects.
+            snapshot = data.NewInstance()
+            snapshot.ShallowCopy(data)
+            locator = vtkModifiedBSPTree()
+            locator.SetDataSet(snapshot)
+            locator.BuildLocator()
+            self.__locators[key] = (mtime, locator, data)
+        return locator, data
+
+    def __intersect_locator(self, target, p0, p1):
+        locator, inverse, tolerance = target
+        a = inverse.MultiplyPoint(tuple(p0) + (1.0,))
+        b = inverse.MultiplyPoint(tuple(p1) + (1.0,))
+        a = [v / a[3] for v in a[:3]]
+        b = [v / b[3] for v in b[:3]]
+
+        t = vtk_mutable(0.0)
+        x = [0.0] * 3
+        pcoords = [0.0] * 3
+        sub_id = vtk_mutable(0)
+        cell_id = vtk_mutable(-1)
+        with self.__lock:
+            hit = locator.IntersectWithLine(
+                a, b, tolerance, t, x, pcoords, sub_id, cell_id)
+        if not hit:
+            return None
+        return float(t), int(cell_id)
+
+
+def field_value(actor, cell_id, position):
+    """
+    Returns value of the field an actor is colored by at world position in
+    cell cell_id, the active point or cell scalars when the mapper does not
+    select an array. Point values are interpolated with the cell weights,
+    for glyph mappers cell_id is the index of the picked instance.
+
+    :return: Float for scalars, tuple for vectors, None without a field.
+    """
+    mapper = LocatorPicker.mapper(actor)
+    data = mapper.GetInput() if mapper else None
+    if data is None or not data.IsA('vtkDataSet'):
+        return None
+
+    mode = mapper.GetScalarMode()
+    point_data = data.GetPointData()
+    cell_data = data.GetCellData()
+    if mode in (VTK_SCALAR_MODE_USE_POINT_FIELD_DATA,
+                VTK_SCALAR_MODE_USE_CELL_FIELD_DATA):
+        if mapper.GetArrayAccessMode() == VTK_GET_ARRAY_BY_NAME:
+            key = mapper.GetArrayName()
+        else:
+            key = mapper.GetArrayId()
+        if mode == VTK_SCALAR_MODE_USE_POINT_FIELD_DATA:
+            point_array, cell_array = point_data.GetArray(key), None
+        else:
+            point_array, cell_array = None, cell_data.GetArray(key)
+    elif mode == VTK_SCALAR_MODE_USE_CELL_DATA:
+        point_array, cell_array = None, cell_data.GetScalars()
+    elif mode == VTK_SCALAR_MODE_USE_POINT_DATA:
+        point_array, cell_array = point_data.GetScalars(), None
+    else:
+        point_array = point_data.GetScalars()
+        cell_array = None if point_array else cell_data.GetScalars()
+
+    if cell_array:
+        value = cell_array.GetTuple(cell_id)
+    elif point_array and mapper.IsA('vtkGlyph3DMapper'):
+        # Glyph instances are picked by the index of their input point.
+        value = point_array.GetTuple(cell_id)
+    elif point_array:
+        inverse = vtkMatrix4x4()
+        vtkMatrix4x4.Invert(actor.GetMatrix(), inverse)
+        local = inverse.MultiplyPoint(tuple(position) + (1.0,))
+        local = [v / local[3] for v in local[:3]]
+        # Generic cell, GetCell(id) shares one cell object per data set.
+        cell = vtkGenericCell()
+        data.GetCell(cell_id, cell)
+        closest = [0.0] * 3
+        pcoords = [0.0] * 3
+        weights = [0.0] * cell.GetNumberOfPoints()
+        cell.EvaluatePosition(local, closest, vtk_mutable(0), pcoords,
+                              vtk_mutable(0.0), weights)
+        value = [0.0] * point_array.GetNumberOfComponents()
+        for i, w in enumerate(weights):
+            for c, v in enumerate(point_array.GetTuple(cell.GetPointId(i))):
+                value[c] += w * v
+    else:
+        return None
+    if len(value) == 1:
+        return value[0]
+    return tuple(value)
+
+
+class HoverProbe:
+    """
+    Probes the scene under the cursor while the mouse moves.
+
+    At most one query is started per frame interval of the scene scheduler
+    and only for the latest cursor position. The view ray, culling and
+    locator building run on the calling thread, only the walk of prebuilt
+    locators runs in a worker thread. The field value is looked up back on
+    the calling thread and the result is broadcast as
+    w_scene_hover_probe(scene, geometry_object, actor, cell_id, position,
+    value), with None values when nothing is under the cursor. Probing never
+    renders the scene.
+    """
+
+    poll_interval = 5
+
+    def __init__(self, scene, picker):
+        """
+        :param scene: VtkScene to probe.
+        :param picker: LocatorPicker, its cached locators are reused.
+        """
+        self.__scene = scene
+        self.__picker = picker
+        self.__executor = None
+        self.__position = None
+        self.__scheduled = False
+        self.__future = None
+        self.__hit = False
+
+    @property
+    def enabled(self):
+        return self.__executor is not None
+
+    @enabled.setter
+    def enabled(self, value):
+        if value and self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=1)
+        elif not value and self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+            self.__position = None
+
+    def move(self, x, y):
+        """
+        Requests probe at display point x, y.
+        """
+        if self.__executor is None:
+            return
+        self.__position = (x, y)
+        self.__schedule()
+
+    def __schedule(self):
+        if not self.__scheduled and self.__future is None:
+            self.__scheduled = True
+            interval = self.__scene.scheduler.frame_interval
+            wizard.timeout(self.__query, int(interval * 1000))
+
+    def __query(self):
+        self.__scheduled = False
+        if self.__executor is None or self.__position is None:
+            return
+        x, y = self.__position
+        self.__position = None
+        renderer = self.__scene.renderer
+        self.__scene.render_window.activate()
+        p0, p1 = LocatorPicker.ray(renderer, x, y)
+        targets = self.__picker.targets(LocatorPicker.actors(renderer), p0, p1)
+        self.__future = self.__executor.submit(
+            self.__picker.intersect_targets, targets, p0, p1)
+        wizard.timeout(self.__poll, self.poll_interval)
+
+    def __poll(self):
+        future = self.__future
+        if not future.done():
+            wizard.timeout(self.__poll, self.poll_interval)
+            return
+        self.__future = None
+        try:
+            result = future.result()
+        except Exception:
+            traceback.print_exc()
+            result = None
+        if self.__executor is None:
+            return
+        if result:
+            actor, cell_id, position = result
+            value = field_value(actor, cell_id, position)
+            wizard.w_scene_hover_probe(
+                self.__scene, getattr(actor, 'geometry_object', None),
+                actor, cell_id, position, value)
+        elif self.__hit:
+            wizard.w_scene_hover_probe(
+                self.__scene, None, None, -1, None, None)
+        self.__hit = result is not None
+        if self.__position is not None:
+            self.__schedule()
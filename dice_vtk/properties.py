@@ -10,7 +10,7 @@
 from dice_tools import wizard, DICEObject, diceProperty, diceSignal, diceSlot
 from dice_tools.helpers.xmodel import modelRole, modelMethod, ModelItem
 from dice_tools.helpers.xmodel import standard_model
-from dice_vtk.geometries.geometry_base import GeometryBase
+from dice_vtk.geometries.geometry_base import GeometryBase, geometry_batch
 from dice_vtk.geometries import ClipWidget, CutterWidget
 from vtk import vtkMath
 
@@ -197,10 +197,15 @@ class PlaneProps(DICEObject):
         self.__scene = props.scene
         self.__model = props.model
         wizard.subscribe(self, props.model)
+        wizard.subscribe(self.w_geometry_batch_changed)
 
     def w_property_changed(self, obj, name, value):
         self.update()
 
+    def w_geometry_batch_changed(self, changes):
+        if self.__widget in changes:
+            self.update()
+
     def w_model_selection_changed(self, model, selected, deselected):
         if len(self.__model.selection) == 1:
             for v in self.__model.selection:
@@ -284,7 +289,7 @@ class PlaneProps(DICEObject):
                 focal_point)
             camera.SetFocalPoint(focal_point)
             self.__scene.renderer.ResetCamera(
-                self.__widget.target.get_bounds(self.__scene))
+                self.__widget.target.cached_bounds(self.__scene))
             self.__scene.update_camera()
             self.__scene.render()
 
@@ -335,10 +340,12 @@ class VtkSceneProperties(DICEObject):
         self.__scene = scene
         self.__model = standard_model(VtkObject)
         self.__widgets = set()
+        self.__items = {}
         self.__plane_props = PlaneProps(self)
         self.__anim_control = AnimControl(self)
         wizard.subscribe(self, self.__model)
         wizard.subscribe(self.w_geometry_object_clicked)
+        wizard.subscribe(self.w_geometry_batch_changed)
 
     def remove_widget(self, item):
         self.__scene.remove_object(item.obj)
@@ -372,6 +379,16 @@ class VtkSceneProperties(DICEObject):
         if obj is None:
             self.__model.current_item = None
 
+    def w_geometry_batch_changed(self, changes):
+        updated = False
+        for obj in changes:
+            item = self.__items.get(obj)
+            if item:
+                wizard.w_model_update_item(item)
+                updated = True
+        if updated:
+            self.update()
+
     def w_model_selection_changed(self, model, selected, deselected):
         for v in deselected:
             v.obj.set_selected(False)
@@ -380,31 +397,58 @@ class VtkSceneProperties(DICEObject):
         self.update()
 
     def add_object(self, obj):
-        if not isinstance(obj, GeometryBase):
-            return
-
-        if isinstance(obj, (ClipWidget, CutterWidget)):
-            for v in self.model:
-                if v.obj == obj.target:
-                    v.elements.append(VtkObject(self, obj))
+        self.add_objects((obj,))
+
+    def add_objects(self, objs):
+        items = []
+        for obj in objs:
+            if not isinstance(obj, GeometryBase):
+                continue
+            if isinstance(obj, (ClipWidget, CutterWidget)):
+                target = self.__items.get(obj.target)
+                if target:
+                    item = VtkObject(self, obj)
+                    self.__items[obj] = item
+                    target.elements.append(item)
                     if obj in self.__widgets:
-                        self.__model.current_item = v.elements[-1]
-                    break
-        else:
-            self.__model.root_elements.append(VtkObject(self, obj))
+                        self.__model.current_item = item
+            else:
+                item = VtkObject(self, obj)
+                self.__items[obj] = item
+                items.append(item)
+        if items:
+            self.__model.root_elements.extend(items)
+
+    def __clear_item(self, item):
+        for v in item.elements:
+            if v.obj in self.__widgets:
+                self.__scene.remove_object(v.obj)
+                self.__widgets.discard(v.obj)
+                self.__clear_item(v)
+            else:
+                self.__model.root_elements.append(v)
+
+    def remove_objects(self, objs):
+        roots = set()
+        for obj in objs:
+            if isinstance(obj, (ClipWidget, CutterWidget)):
+                self.remove_object(obj)
+            elif isinstance(obj, GeometryBase):
+                roots.add(obj)
+        if not roots:
+            return
+        elements = self.__model.root_elements
+        for i in reversed(range(len(elements))):
+            v = elements[i]
+            if v.obj in roots:
+                del elements[i]
+                self.__items.pop(v.obj, None)
+                self.__clear_item(v)
 
     def remove_object(self, obj):
         if not isinstance(obj, GeometryBase):
             return
-
-        def clear(item):
-            for v in item.elements:
-                if v.obj in self.__widgets:
-                    self.__scene.remove_object(v.obj)
-                    self.__widgets.discard(v.obj)
-                    clear(v)
-                else:
-                    self.__model.root_elements.append(v)
+        self.__items.pop(obj, None)
 
         if isinstance(obj, (ClipWidget, CutterWidget)):
             for v in self.model:
@@ -413,14 +457,14 @@ class VtkSceneProperties(DICEObject):
                         if vv.obj == obj:
                             del v.elements[i]
                             self.__widgets.discard(obj)
-                            clear(vv)
+                            self.__clear_item(vv)
                             break
                     break
         else:
             for i, v in enumerate(self.__model.root_elements):
                 if v.obj == obj:
                     del self.__model.root_elements[i]
-                    clear(v)
+                    self.__clear_item(v)
                     break
 
     update = diceSignal(name='update')
@@ -446,8 +490,9 @@ class VtkSceneProperties(DICEObject):
 
     @edge_visible.setter
     def edge_visible(self, value):
-        for v in self.__model.selection:
-            v.obj.edge_visible = value
+        with geometry_batch():
+            for v in self.__model.selection:
+                v.obj.edge_visible = value
         self.update()
 
     @diceProperty('QVariant', notify=update)
@@ -460,8 +505,9 @@ class VtkSceneProperties(DICEObject):
 
     @representation.setter
     def representation(self, value):
-        for v in self.__model.selection:
-            v.obj.representation = value
+        with geometry_batch():
+            for v in self.__model.selection:
+                v.obj.representation = value
         self.update()
 
     @diceProperty('QVariantList', notify=update)
@@ -474,8 +520,9 @@ class VtkSceneProperties(DICEObject):
 
     @color.setter
     def color(self, value):
-        for v in self.__model.selection:
-            v.obj.color = value
+        with geometry_batch():
+            for v in self.__model.selection:
+                v.obj.color = value
         self.update()
 
     @diceProperty('QVariant', notify=update)
@@ -488,8 +535,9 @@ class VtkSceneProperties(DICEObject):
 
     @opacity.setter
     def opacity(self, value):
-        for v in self.__model.selection:
-            v.obj.opacity = value
+        with geometry_batch():
+            for v in self.__model.selection:
+                v.obj.opacity = value
         self.update()
 
     @diceSlot()
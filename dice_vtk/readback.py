@@ -0,0 +1,283 @@
+# Standard Python modules
+# =======================
+import ctypes
+import mmap
+from collections import deque
+from contextlib import contextmanager
+from tempfile import NamedTemporaryFile
+
+# External modules
+# ================
+from OpenGL import GL
+
+# DICE modules
+# ============
+from dice_tools import wizard
+
+
+def release_current(window):
+    """
+    Releases OpenGL context of window from the calling thread when VTK
+    supports it, so another thread can make it current.
+    """
+    release = getattr(window, 'ReleaseCurrent', None)
+    if release:
+        release()
+
+
+@contextmanager
+def current(window):
+    """
+    Makes OpenGL context of window current for the block and releases it
+    afterwards.
+    """
+    window.MakeCurrent()
+    try:
+        yield
+    finally:
+        release_current(window)
+
+
+class SyncReadback:
+    """
+    Reads the framebuffer with a blocking glReadPixels call right after
+    rendering and hands a bytes copy of it to the consumer.
+    """
+
+    def read(self, window, deliver):
+        """
+        Reads pixels of the current frame of window.
+
+        :param window: vtkRenderWindow which was just rendered.
+        :param deliver: Callable taking (size, buffer).
+        """
+        size = window.GetSize()
+        buffer = GL.glReadPixels(0, 0, size[0], size[1], GL.GL_RGBA,
+                                 GL.GL_UNSIGNED_BYTE)
+        deliver(size, buffer)
+
+    def flush(self):
+        pass
+
+    def release(self):
+        pass
+
+
+class PixelBufferReadback:
+    """
+    Reads the framebuffer asynchronously through a ring of pixel buffer
+    objects. The transfer of a frame is started right after rendering and
+    the frame is delivered on the next tick, so the copy overlaps with the
+    rest of the event loop. Up to count - 1 frames rendered within one tick
+    stay in flight, the oldest one is delivered when a buffer is needed.
+
+    The buffer passed to the consumer is a memoryview over the mapped pixel
+    buffer. It is only valid during the call and must be copied if the
+    consumer needs to keep it. The OpenGL context is made current for every
+    access and released afterwards, so windows drawn by worker threads can
+    be read back too.
+    """
+
+    def __init__(self, count=2):
+        if count < 2:
+            raise ValueError('At least two pixel buffers are required')
+        self.__count = count
+        self.__window = None
+        self.__buffers = None
+        self.__capacity = [0] * count
+        self.__index = 0
+        self.__pending = deque()
+
+    @property
+    def count(self):
+        return self.__count
+
+    def read(self, window, deliver):
+        """
+        Starts asynchronous readback of the current frame of window.
+
+        :param window: vtkRenderWindow which was just rendered.
+        :param deliver: Callable taking (size, buffer).
+        """
+        if self.__window is not window:
+            # Pixel buffers belong to the OpenGL context of the window.
+            self.release()
+            self.__window = window
+            with current(window):
+                self.__buffers = [int(v)
+                                  for v in GL.glGenBuffers(self.__count)]
+            self.__capacity = [0] * self.__count
+            self.__index = 0
+        with current(window):
+            while len(self.__pending) >= self.__count - 1:
+                self.__deliver(*self.__pending.popleft())
+
+            size = window.GetSize()
+            nbytes = size[0] * size[1] * 4
+            index = self.__index
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self.__buffers[index])
+            if self.__capacity[index] != nbytes:
+                GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, nbytes, None,
+                                GL.GL_STREAM_READ)
+                self.__capacity[index] = nbytes
+            GL.glReadPixels(0, 0, size[0], size[1], GL.GL_RGBA,
+                            GL.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+        self.__pending.append((index, size, nbytes, deliver))
+        self.__index = (index + 1) % self.__count
+        wizard.timeout(self.flush, 0)
+
+    def flush(self):
+        """
+        Delivers frames which are being transferred, oldest first.
+        """
+        if not self.__pending:
+            return
+        with current(self.__window):
+            while self.__pending:
+                self.__deliver(*self.__pending.popleft())
+
+    def __deliver(self, index, size, nbytes, deliver):
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self.__buffers[index])
+        try:
+            address = GL.glMapBuffer(GL.GL_PIXEL_PACK_BUFFER, GL.GL_READ_ONLY)
+            if address:
+                try:
+                    data = (ctypes.c_ubyte * nbytes).from_address(address)
+                    deliver(size, memoryview(data).cast('B'))
+                finally:
+                    GL.glUnmapBuffer(GL.GL_PIXEL_PACK_BUFFER)
+        finally:
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+    def release(self):
+        """
+        Delivers pending frames and frees pixel buffers.
+        """
+        self.flush()
+        if self.__buffers is not None:
+            with current(self.__window):
+                GL.glDeleteBuffers(self.__count, self.__buffers)
+        self.__window = None
+        self.__buffers = None
+
+
+class FrameRing:
+    """
+    Ring of frame slots in a memory mapped temporary file. Slot index is
+    located at index * slot_capacity bytes from the beginning of the file at
+    path, so other processes can map the same file and read frames without
+    pickling them. The file grows when frames do not fit into slots anymore,
+    consumers in other processes should remap it when slot_capacity changes.
+    """
+
+    def __init__(self, slots=3):
+        if slots < 1:
+            raise ValueError('At least one slot is required')
+        self.__slots = slots
+        self.__capacity = 0
+        self.__next = 0
+        self.__mmap = None
+        self.__file = NamedTemporaryFile(prefix='dice_vtk_frames_')
+
+    @property
+    def path(self):
+        return self.__file.name
+
+    @property
+    def slots(self):
+        return self.__slots
+
+    @property
+    def slot_capacity(self):
+        return self.__capacity
+
+    def offset(self, index):
+        return index * self.__capacity
+
+    def reserve(self, nbytes):
+        """
+        Returns index of the slot the next frame of nbytes goes to.
+        """
+        if nbytes > self.__capacity:
+            if self.__mmap is not None:
+                self.__mmap.close()
+            self.__capacity = nbytes
+            self.__file.truncate(nbytes * self.__slots)
+            self.__file.flush()
+            self.__mmap = mmap.mmap(self.__file.fileno(),
+                                    nbytes * self.__slots)
+        index = self.__next
+        self.__next = (index + 1) % self.__slots
+        return index
+
+    def pixels(self, index, nbytes):
+        """
+        Returns ctypes array over the slot memory, for direct writes.
+        """
+        return (ctypes.c_ubyte * nbytes).from_buffer(self.__mmap,
+                                                     self.offset(index))
+
+    @contextmanager
+    def view(self, index, nbytes):
+        """
+        Context manager giving memoryview over the slot memory.
+        """
+        offset = self.offset(index)
+        with memoryview(self.__mmap) as view:
+            with view[offset:offset + nbytes] as slot:
+                yield slot
+
+    def close(self):
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+        self.__file.close()
+
+
+class FrameRingReadback:
+    """
+    Reads the framebuffer straight into the next slot of a FrameRing, so
+    pixels are copied once from OpenGL into shared memory. Consumers are
+    notified with the slot index and frame size and can read the slot from
+    the ring in this or another process until the ring wraps around.
+    """
+
+    def __init__(self, ring, notify):
+        """
+        :param ring: FrameRing to write frames to.
+        :param notify: Callable taking (index, size), called for every frame.
+        """
+        self.__ring = ring
+        self.__notify = notify
+
+    @property
+    def ring(self):
+        return self.__ring
+
+    def read(self, window, deliver):
+        """
+        Reads pixels of the current frame of window into the ring.
+
+        :param window: vtkRenderWindow which was just rendered.
+        :param deliver: Callable taking (size, buffer). The buffer is a
+        memoryview over the ring slot, valid only during the call.
+        """
+        size = window.GetSize()
+        nbytes = size[0] * size[1] * 4
+        index = self.__ring.reserve(nbytes)
+        pixels = self.__ring.pixels(index, nbytes)
+        GL.glReadPixels(0, 0, size[0], size[1], GL.GL_RGBA,
+                        GL.GL_UNSIGNED_BYTE, pixels)
+        # Drop the export of the mapping so the ring can be resized.
+        del pixels
+        self.__notify(index, size)
+        with self.__ring.view(index, nbytes) as view:
+            deliver(size, view)
+
+    def flush(self):
+        pass
+
+    def release(self):
+        pass
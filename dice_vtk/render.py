@@ -0,0 +1,255 @@
+"""
+Renders FOAM cases to image files without the interactive application.
+
+    python -m dice_vtk.render CASE SCENE.json -o OUTPUT [--workers N]
+
+The scene description is a JSON object::
+
+    {
+        "size": [1280, 720],
+        "background": [0.32, 0.34, 0.43],
+        "objects": [
+            {"patch": "walls", "color": [1, 1, 1], "opacity": 1.0,
+             "color_by": {"array": "p", "association": "cell",
+                          "range": [0, 1]}}
+        ],
+        "camera": {... as returned by VtkScene.get_camera_params ...},
+        "times": [0.1, 0.2],
+        "keyframes": [{... camera params ...}, ...]
+    }
+
+When keyframes are given every keyframe is rendered at the last time (or
+"time" when given), otherwise every time step from "times" (all by default)
+is rendered with "camera". Objects not listed are hidden, all patches are
+shown when "objects" is missing.
+"""
+# Standard Python modules
+# =======================
+import argparse
+import json
+import multiprocessing
+import os
+
+# External modules
+# ================
+from vtk import vtkRenderer
+from vtk import vtkRenderWindow
+from vtk import vtkWindowToImageFilter
+from vtk import vtkPNGWriter
+
+# DICE modules
+# ============
+from dice_vtk.utils.foam_reader import FoamReader
+
+
+class HeadlessScene:
+    """
+    Offscreen scene geometry objects can be attached to without a View.
+    """
+
+    def __init__(self, size_x=1280, size_y=720):
+        self.renderer = vtkRenderer()
+        self.render_window = vtkRenderWindow()
+        self.render_window.SetOffScreenRendering(1)
+        self.render_window.AddRenderer(self.renderer)
+        self.render_window.SetSize(size_x, size_y)
+        self.__objects = []
+
+    @property
+    def objects(self):
+        return self.__objects
+
+    def add_object(self, obj):
+        if obj not in self.__objects:
+            self.__objects.append(obj)
+            obj.attach(self)
+
+    def set_camera_params(self, clipping_range=(0.01, 1000.01),
+                          focal_point=(0., 0., 0.),
+                          position=(0., 0., 1.),
+                          roll=0.,
+                          view=(0., 0., 1.)):
+        """
+        Changes camera parameters, see VtkScene.set_camera_params.
+        """
+        camera = self.renderer.GetActiveCamera()
+        camera.SetClippingRange(clipping_range)
+        camera.SetFocalPoint(focal_point)
+        camera.SetPosition(position)
+        camera.SetRoll(roll)
+        camera.SetViewUp(view)
+
+    def save(self, file_name):
+        """
+        Renders scene and writes the frame to PNG file.
+        """
+        self.renderer.ResetCameraClippingRange()
+        self.render_window.Render()
+        image = vtkWindowToImageFilter()
+        image.SetInput(self.render_window)
+        image.ReadFrontBufferOff()
+        image.Update()
+        writer = vtkPNGWriter()
+        writer.SetFileName(file_name)
+        writer.SetInputConnection(image.GetOutputPort())
+        writer.Write()
+
+
+def color_by(obj, array, association='cell', range=None):
+    """
+    Colors geometry object by field array.
+    """
+    mapper = obj.mapper
+    mapper.ScalarVisibilityOn()
+    if association == 'point':
+        mapper.SetScalarModeToUsePointFieldData()
+    else:
+        mapper.SetScalarModeToUseCellFieldData()
+    mapper.SelectColorArray(array)
+    if range is None:
+        mapper.Update()
+        data = mapper.GetInput()
+        if association == 'point':
+            values = data.GetPointData().GetArray(array)
+        else:
+            values = data.GetCellData().GetArray(array)
+        if values is None:
+            return
+        range = values.GetRange(-1)
+    mapper.SetScalarRange(range)
+
+
+def build_scene(case, description):
+    """
+    Loads FOAM case and builds HeadlessScene from scene description.
+
+    :return: Tuple (scene, reader, coloring), where coloring is a list of
+    (geometry object, color_by arguments).
+    """
+    reader = FoamReader(case)
+    scene = HeadlessScene(*description.get('size', (1280, 720)))
+    scene.renderer.SetBackground(
+        description.get('background', (0.32, 0.34, 0.43)))
+
+    patches = dict(zip(reader.patch_names, reader.patches))
+    objects = description.get('objects')
+    if objects is None:
+        objects = [dict(patch=v) for v in reader.patch_names]
+    coloring = []
+    for v in objects:
+        v = dict(v)
+        obj = patches[v.pop('patch')]
+        if 'color_by' in v:
+            coloring.append((obj, v.pop('color_by')))
+        for name, value in v.items():
+            setattr(obj, name, value)
+        scene.add_object(obj)
+    return scene, reader, coloring
+
+
+def set_time(reader, time):
+    """
+    Sets reader to the case time closest to time. Differences up to float
+    round off of the scene description are accepted.
+
+    :raise ValueError: When time is not a time of the case.
+    """
+    times = reader.times
+    if not times:
+        raise ValueError('Case has no time steps, {} requested'.format(time))
+    nearest = min(times, key=lambda v: abs(v - time))
+    if abs(nearest - time) > 1e-6 * max(1.0, abs(time)):
+        raise ValueError('Time {} is not a time of the case, nearest is '
+                         '{}'.format(time, nearest))
+    if not reader.set_time(nearest):
+        raise ValueError('Failed to set time {}'.format(nearest))
+
+
+def frames_of(description, times):
+    """
+    Returns list of (time, camera params) to render.
+    """
+    keyframes = description.get('keyframes')
+    if keyframes:
+        time = description.get('time', times[-1] if times else None)
+        return [(time, v) for v in keyframes]
+    camera = description.get('camera')
+    return [(v, camera) for v in description.get('times') or times]
+
+
+_worker = None
+
+
+def _init_worker(case, description, output):
+    global _worker
+    scene, reader, coloring = build_scene(case, description)
+    _worker = dict(scene=scene, reader=reader, coloring=coloring,
+                   output=output, time=None)
+
+
+def _render_frame(frame):
+    index, (time, camera) = frame
+    scene = _worker['scene']
+    if time is not None and time != _worker['time']:
+        set_time(_worker['reader'], time)
+        _worker['time'] = time
+    for obj, kwargs in _worker['coloring']:
+        color_by(obj, **kwargs)
+    if camera:
+        scene.set_camera_params(**camera)
+    else:
+        scene.renderer.ResetCamera()
+    file_name = os.path.join(_worker['output'],
+                             'frame_{:05d}.png'.format(index))
+    scene.save(file_name)
+    return file_name
+
+
+def render_frames(case, description, output, workers=1):
+    """
+    Renders all frames of scene description to PNG files in output,
+    distributing them over a pool of processes, each with its own offscreen
+    window and reader.
+
+    :param case: Path to FOAM case.
+    :param description: Scene description dict.
+    :param output: Output directory.
+    :param workers: Number of worker processes.
+    :return: List of written file names.
+    """
+    os.makedirs(output, exist_ok=True)
+    times = description.get('times')
+    if times is None and not description.get('keyframes'):
+        times = FoamReader(case).times
+    frames = list(enumerate(frames_of(description, times or [])))
+    if workers <= 1:
+        _init_worker(case, description, output)
+        return [_render_frame(v) for v in frames]
+    # Contiguous chunks keep time steps of a worker together.
+    chunk = max(1, -(-len(frames) // workers))
+    with multiprocessing.Pool(workers, _init_worker,
+                              (case, description, output)) as pool:
+        return sorted(pool.imap_unordered(_render_frame, frames, chunk))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m dice_vtk.render',
+        description='Renders FOAM case to PNG files.')
+    parser.add_argument('case', help='Path to FOAM case directory.')
+    parser.add_argument('scene', help='Path to JSON scene description.')
+    parser.add_argument('-o', '--output', default='frames',
+                        help='Output directory.')
+    parser.add_argument('-w', '--workers', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help='Number of worker processes.')
+    args = parser.parse_args()
+    with open(args.scene) as f:
+        description = json.load(f)
+    for v in render_frames(args.case, description, args.output,
+                           args.workers):
+        print(v)
+
+
+if __name__ == '__main__':
+    main()
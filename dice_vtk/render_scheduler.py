@@ -0,0 +1,137 @@
+# Standard Python modules
+# =======================
+import math
+from time import perf_counter
+
+# External modules
+# ================
+
+# DICE modules
+# ============
+from dice_tools import wizard
+
+
+class RenderScheduler:
+    """
+    Coalesces render requests of a scene and caps its frame rate.
+
+    Interactive requests are rendered right away when at least min_interval
+    passed since the previous frame. Background requests are never rendered
+    inline, they wait for the next tick and for 1/fps seconds since the
+    previous frame. All requests arriving while a frame is pending are
+    merged into it.
+
+    Callables in frame_callbacks are called right before every frame, e.g.
+    to hand coalesced input events to VTK. Requests they make are merged
+    into that frame.
+    """
+
+    def __init__(self, render, fps=60.0, min_interval=1.0/120):
+        """
+        :param render: Callable doing the actual rendering.
+        :param fps: Target frame rate for background renders, 0 to disable
+        the cap.
+        :param min_interval: Minimal time in seconds between frames.
+        """
+        self.__render = render
+        self.frame_callbacks = []
+        self.fps = fps
+        self.min_interval = min_interval
+        self.__last = None
+        self.__pending = False
+        self.__due = None
+        self.__requests = 0
+        self.__interactive_requests = 0
+        self.__frames = 0
+        self.__starting = False
+
+    @property
+    def frame_interval(self):
+        """
+        Time in seconds between background frames.
+        """
+        interval = 1.0 / self.fps if self.fps else 0.0
+        return max(interval, self.min_interval)
+
+    @property
+    def pending(self):
+        return self.__pending
+
+    @property
+    def stats(self):
+        """
+        Dict with numbers of render requests, interactive requests, rendered
+        frames and requests coalesced into other frames.
+        """
+        return dict(
+            requests=self.__requests,
+            interactive_requests=self.__interactive_requests,
+            frames=self.__frames,
+            coalesced=self.__requests - self.__frames
+            )
+
+    def reset_stats(self):
+        self.__requests = 0
+        self.__interactive_requests = 0
+        self.__frames = 0
+
+    def request(self, interactive=False):
+        """
+        Requests a frame.
+
+        :param interactive: True for frames caused by user interaction.
+        """
+        self.__requests += 1
+        if self.__starting:
+            return
+        self.__pending = True
+        now = perf_counter()
+        if interactive:
+            self.__interactive_requests += 1
+            interval = self.min_interval
+        else:
+            interval = self.frame_interval
+        if self.__last is None:
+            delay = 0.0
+        else:
+            delay = max(0.0, interval - (now - self.__last))
+
+        if interactive and delay == 0.0:
+            self.render_now()
+        elif self.__due is None or now + delay < self.__due:
+            self.__due = now + delay
+            wizard.timeout(self.__fire, int(math.ceil(delay * 1000)))
+
+    def render_now(self):
+        """
+        Renders pending frame immediately.
+        """
+        self.__pending = False
+        self.__due = None
+        self.__last = perf_counter()
+        self.__frames += 1
+        self.__starting = True
+        try:
+            for callback in self.frame_callbacks:
+                callback()
+        finally:
+            self.__starting = False
+        self.__render()
+
+    def cancel(self):
+        """
+        Drops pending frame.
+        """
+        self.__pending = False
+        self.__due = None
+
+    def __fire(self):
+        if self.__pending and self.__due is not None:
+            if perf_counter() >= self.__due:
+                self.render_now()
+            else:
+                # Waiting at least a millisecond keeps the loop from
+                # spinning on sub-millisecond remainders.
+                delay = self.__due - perf_counter()
+                wizard.timeout(self.__fire,
+                               max(1, int(math.ceil(delay * 1000))))
@@ -19,88 +19,261 @@ from dice_tools.helpers.xview import View
 
 from dice_vtk.properties import VtkSceneProperties
 from dice_vtk.interactor import Interactor
+from dice_vtk.selection import AreaSelectInteractor
 from dice_vtk.geometries import TransformGismo
 from dice_vtk.geometries import AxesWidget
+from dice_vtk.geometries.geometry_base import GeometryBase
+from dice_vtk.readback import SyncReadback, FrameRing, FrameRingReadback
+from dice_vtk.readback import current, release_current
+from dice_vtk.frames import TileDiffer, upsample
+from dice_vtk.render_scheduler import RenderScheduler
+from dice_vtk.stats import FrameStats
+from dice_vtk.handle_scaler import HandleScaler
+from dice_vtk.lod import LODController
 
 import os
+import math
 from time import time, perf_counter
 import mmap
 from OpenGL import GL
 from tempfile import NamedTemporaryFile
 from contextlib import contextmanager
+from collections import OrderedDict
 import weakref
 import sys
 
 
 class RenderWindowProxy(vtkGenericOpenGLRenderWindow):
+    """
+    Render window of a scene. By default renderers of the scene are moved
+    into one shared offscreen window whenever the scene is rendered. When
+    window_pool_size is non zero each scene renders to its own persistent
+    offscreen window instead, so OpenGL resources survive switching between
+    scenes. At most window_pool_size windows are kept, the least recently
+    used one is released when a new one is needed.
+    """
+
+    window_pool_size = 0
 
     __render_window = None
     __current_proxy = None
+    __pool = OrderedDict()
 
     def __init__(self, scene):
         if not RenderWindowProxy.__render_window:
             RenderWindowProxy.__render_window = vtkRenderWindow()
             RenderWindowProxy.__render_window.SetOffScreenRendering(1)
         self.__scene = scene
+        self.__readback = SyncReadback()
+        self.__render_scale = 1.0
+        self.__window = None
+
+    @property
+    def readback(self):
+        return self.__readback
+
+    @readback.setter
+    def readback(self, value):
+        if value is not self.__readback:
+            self.__readback.release()
+            self.__readback = value
+
+    @property
+    def render_scale(self):
+        """
+        Scale of the internal rendering resolution to the window size.
+        """
+        return self.__render_scale
+
+    @render_scale.setter
+    def render_scale(self, value):
+        if value != self.__render_scale:
+            self.__render_scale = value
+            window = self.__active_window()
+            if window:
+                window.SetSize(self.render_size())
+
+    def render_size(self):
+        """
+        Returns size frames are rendered at, i.e. window size multiplied by
+        render_scale.
+        """
+        sx, sy = self.GetSize()
+        scale = self.__render_scale
+        return max(1, int(sx * scale)), max(1, int(sy * scale))
+
+    def is_active(self):
+        return ((RenderWindowProxy.__current_proxy is not None) and
+                (RenderWindowProxy.__current_proxy() == self))
+
+    def __active_window(self):
+        if self.__window:
+            return self.__window
+        if self.is_active():
+            return RenderWindowProxy.__render_window
+        return None
 
     def SetSize(self, sx, sy):
         super().SetSize(sx, sy)
-        if ((RenderWindowProxy.__current_proxy is not None) and
-                (RenderWindowProxy.__current_proxy() == self)):
-            RenderWindowProxy.__render_window.SetSize(sx, sy)
+        window = self.__active_window()
+        if window:
+            window.SetSize(self.render_size())
+
+    @staticmethod
+    def __move_renderers(source, target):
+        renderers = source.GetRenderers()
+        renderers.InitTraversal()
+        r = renderers.GetNextItem()
+        while r:
+            source.RemoveRenderer(r)
+            if target:
+                target.AddRenderer(r)
+            r = renderers.GetNextItem()
 
     @staticmethod
     def release(ref):
         if RenderWindowProxy.__current_proxy == ref:
-            renderers = RenderWindowProxy.__render_window.GetRenderers()
-            renderers.InitTraversal()
-            while r:
-                RenderWindowProxy.__render_window.RemoveRenderer(r)
-                r = renderers.GetNextItem()
+            RenderWindowProxy.__move_renderers(
+                RenderWindowProxy.__render_window, None)
             RenderWindowProxy.__current_proxy = None
 
+    @staticmethod
+    def __release_pooled(ref):
+        window = RenderWindowProxy.__pool.pop(ref, None)
+        if window:
+            window.Finalize()
+
     def deactivate(self):
-        if ((RenderWindowProxy.__current_proxy is not None) and
-                (RenderWindowProxy.__current_proxy() == self)):
+        if self.is_active():
             interactor = self.GetInteractor()
             interactor.SetRenderWindow(self)
-            renderers = RenderWindowProxy.__render_window.GetRenderers()
-            renderers.InitTraversal()
-            r = renderers.GetNextItem()
-            while r:
-                RenderWindowProxy.__render_window.RemoveRenderer(r)
-                self.AddRenderer(r)
-                r = renderers.GetNextItem()
+            self.__move_renderers(RenderWindowProxy.__render_window, self)
             RenderWindowProxy.__current_proxy = None
 
+    def evict(self):
+        """
+        Releases own persistent window of the proxy, if any.
+        """
+        window = self.__window
+        if window:
+            self.__readback.release()
+            for ref, v in list(RenderWindowProxy.__pool.items()):
+                if v is window:
+                    del RenderWindowProxy.__pool[ref]
+            self.GetInteractor().SetRenderWindow(self)
+            self.__move_renderers(window, self)
+            self.__window = None
+            window.Finalize()
+
+    def __activate_pooled(self):
+        pool = RenderWindowProxy.__pool
+        if self.__window:
+            for ref, window in pool.items():
+                if window is self.__window:
+                    pool.move_to_end(ref)
+                    break
+        else:
+            self.deactivate()
+            while pool and len(pool) >= RenderWindowProxy.window_pool_size:
+                ref = next(iter(pool))
+                proxy = ref()
+                if proxy:
+                    proxy.evict()
+                else:
+                    RenderWindowProxy.__release_pooled(ref)
+            window = vtkRenderWindow()
+            window.SetOffScreenRendering(1)
+            window.SetSize(self.render_size())
+            self.__move_renderers(self, window)
+            window.SetNumberOfLayers(self.GetNumberOfLayers())
+            pool[weakref.ref(self, RenderWindowProxy.__release_pooled)] = window
+            self.__window = window
+        self.GetInteractor().SetRenderWindow(self.__window)
+
     def activate(self):
+        if RenderWindowProxy.window_pool_size:
+            self.__activate_pooled()
+            return
+        if self.__window:
+            self.evict()
         if RenderWindowProxy.__current_proxy is not None:
             proxy = RenderWindowProxy.__current_proxy()
             if proxy == self:
                 return
             proxy.deactivate()
         RenderWindowProxy.__current_proxy = weakref.ref(self, self.release)
-        RenderWindowProxy.__render_window.SetSize(self.GetSize())
-        renderers = self.GetRenderers()
-        renderers.InitTraversal()
-        r = renderers.GetNextItem()
-        while r:
-            self.RemoveRenderer(r)
-            RenderWindowProxy.__render_window.AddRenderer(r)
-            r = renderers.GetNextItem()
+        RenderWindowProxy.__render_window.SetSize(self.render_size())
+        self.__move_renderers(self, RenderWindowProxy.__render_window)
         RenderWindowProxy.__render_window.SetNumberOfLayers(self.GetNumberOfLayers())
         interactor = self.GetInteractor()
         interactor.SetRenderWindow(RenderWindowProxy.__render_window)
 
     def Render(self):
+        stats = self.__scene.frame_stats
         self.activate()
-        RenderWindowProxy.__render_window.Render()
+        window = self.__active_window()
+        start = perf_counter()
+        window.Render()
+        while GL.glGetError():
+            pass
+        stats.add('render', perf_counter() - start)
+        self.__read(window)
+
+    def __read(self, window):
+        stats = self.__scene.frame_stats
+        if stats.enabled:
+            start = perf_counter()
+            transfer = stats.get('transfer')
+            self.__readback.read(window, self.deliver)
+            stats.add('readback', perf_counter() - start -
+                      (stats.get('transfer') - transfer))
+        else:
+            self.__readback.read(window, self.deliver)
+
+    def release_context(self):
+        """
+        Releases OpenGL context of the active window from the calling
+        thread, see release_current.
+        """
+        window = self.__active_window()
+        if window:
+            release_current(window)
+
+    def draw(self):
+        """
+        Renders already activated window without reading it back. Unlike
+        Render it does not touch scene state, so it can be called from a
+        worker thread. The OpenGL context is released afterwards when VTK
+        supports it, read_back then reads the frame on the calling thread.
+        """
+        window = self.__active_window()
+        window.Render()
         while GL.glGetError():
             pass
-        size = RenderWindowProxy.__render_window.GetSize()
-        buffer = GL.glReadPixels(0, 0, size[0], size[1], GL.GL_RGBA, 
-                             GL.GL_UNSIGNED_BYTE)
-        self.__scene.updated(size, buffer)
+        release_current(window)
+
+    def read_back(self):
+        """
+        Reads frame drawn by draw through the readback of the proxy and
+        delivers it. The OpenGL context is held only during the read.
+        """
+        window = self.__active_window()
+        with current(window):
+            self.__read(window)
+
+    def deliver(self, size, data):
+        """
+        Passes rendered frame to the scene, upsampling it to the window size
+        when rendered at reduced resolution.
+        """
+        stats = self.__scene.frame_stats
+        start = perf_counter()
+        if self.__render_scale != 1.0:
+            window_size = self.GetSize()
+            data = upsample(data, size, window_size)
+            size = window_size
+        self.__scene.updated(size, data)
+        stats.add('transfer', perf_counter() - start)
 
 
 class VtkScene(View):
@@ -127,13 +300,35 @@ class VtkScene(View):
         self.render_window.AddRenderer(self.overlay)
         self.render_window.SetNumberOfLayers(2)
 
+        self.__scheduler = RenderScheduler(self.__render_now)
         self.interactor = Interactor(self)
+        self.handle_scaler = HandleScaler(self)
+        self.lod = LODController(self)
         self.transform_gismo = TransformGismo(self)
         self.interactor.Enable()
         self.interactors = [self.interactor]
 
-        self.__objects = []
+        self.__objects = {}
+        self.__object_bounds = {}
+        self.__stale_bounds = set()
+        self.__foreign_props = []
+        self.__props_mtime = None
+        self.__bounds = None
+        self.__bounds_dirty = False
+        self.__tile_differ = None
+        self.__encoder = None
+        self.__frame_ring = None
+        self.__render_backend = None
+        self.__frame_stats = FrameStats()
         self.__render_deferred = False
+        self.__interactive_scale = 1.0
+        self.__still_delay = 300
+        self.__buttons = set()
+        self.__interaction_time = None
+        self.__camera_state = None
+        self.__camera_params = None
+        self.__camera_time = None
+        self.__camera_settle_delay = 500
         self.selection = set()
         self.__name = 'Unnamed'
         self.__active = True
@@ -141,6 +336,8 @@ class VtkScene(View):
         wizard.w_vtk_scene_created(self)
         wizard.subscribe(self.w_reset_camera_to_object)
         wizard.subscribe(self.w_property_changed)
+        wizard.subscribe(self.w_geometry_batch_changed)
+        wizard.subscribe(self.w_animation_frame_changed)
         self.__axes = AxesWidget()
         self.add_object(self.__axes)
 
@@ -152,6 +349,252 @@ class VtkScene(View):
     def properties(self):
         return self.__properties
 
+    @property
+    def scheduler(self):
+        """
+        RenderScheduler coalescing render requests of the scene.
+        """
+        return self.__scheduler
+
+    @property
+    def frame_stats(self):
+        """
+        FrameStats with timings of the recent frames.
+        """
+        return self.__frame_stats
+
+    @diceProperty('bool', name='frameStatsEnabled')
+    def frame_stats_enabled(self):
+        return self.__frame_stats.enabled
+
+    @frame_stats_enabled.setter
+    def frame_stats_enabled(self, value):
+        self.__frame_stats.enabled = value
+
+    @diceProperty('QVariant', name='frameStats')
+    def frame_stats_summary(self):
+        """
+        Summary of the recent frames, see FrameStats.summary.
+        """
+        return self.__frame_stats.summary()
+
+    @diceProperty('bool', name='hoverProbe')
+    def hover_probe(self):
+        """
+        When enabled the object, cell and field value under the cursor are
+        broadcast as w_scene_hover_probe while the mouse moves.
+        """
+        return self.interactor.hover_probe.enabled
+
+    @hover_probe.setter
+    def hover_probe(self, value):
+        self.interactor.hover_probe.enabled = value
+
+    def __count_visible(self):
+        actors = self.renderer.GetActors()
+        actors.InitTraversal()
+        count = 0
+        triangles = 0
+        actor = actors.GetNextActor()
+        while actor:
+            if actor.GetVisibility():
+                count += 1
+                data = actor.GetMapper() and actor.GetMapper().GetInput()
+                if data and data.IsA('vtkPolyData'):
+                    triangles += data.GetNumberOfPolys()
+                    triangles += data.GetNumberOfStrips()
+            actor = actors.GetNextActor()
+        self.__frame_stats.add('actors', count)
+        self.__frame_stats.add('triangles', triangles)
+
+    @property
+    def render_backend(self):
+        """
+        Optional backend rendering frames of the scene instead of rendering
+        them inline, i.e. ParallelRenderer.
+        """
+        return self.__render_backend
+
+    @render_backend.setter
+    def render_backend(self, value):
+        if value is not self.__render_backend:
+            if self.__render_backend:
+                self.__render_backend.forget(self)
+            self.__render_backend = value
+
+    @property
+    def readback(self):
+        """
+        Framebuffer readback strategy, i.e. SyncReadback (default) or
+        PixelBufferReadback.
+        """
+        return self.render_window.readback
+
+    @readback.setter
+    def readback(self, value):
+        self.render_window.readback = value
+
+    @property
+    def tile_size(self):
+        """
+        Size of tiles frames are compared by. When non zero unchanged frames
+        are dropped and changed tiles are broadcast with w_scene_frame_tiles
+        instead of pushing frames to the view. The view gets whole frames
+        only on the first frame, on resize and after resync_frame, consumers
+        compose the tiles in between. Zero disables tiled delivery.
+        """
+        if self.__tile_differ:
+            return self.__tile_differ.tile_size
+        return 0
+
+    @tile_size.setter
+    def tile_size(self, value):
+        if value != self.tile_size:
+            self.__tile_differ = TileDiffer(value) if value else None
+
+    @diceSlot(name='resyncFrame')
+    def resync_frame(self):
+        """
+        Pushes the next frame to the view as a whole with tiled delivery,
+        e.g. for a consumer which joined late.
+        """
+        if self.__tile_differ:
+            self.__tile_differ.reset()
+        self.render()
+
+    @property
+    def encoder(self):
+        """
+        Optional FrameEncoder every rendered frame is submitted to.
+        """
+        return self.__encoder
+
+    @encoder.setter
+    def encoder(self, value):
+        if value is not self.__encoder:
+            if self.__encoder:
+                self.__encoder.shutdown(False)
+            self.__encoder = value
+
+    @property
+    def frame_ring(self):
+        """
+        FrameRing frames are written to, None when disabled.
+        """
+        return self.__frame_ring
+
+    @property
+    def frame_ring_slots(self):
+        """
+        Number of slots of the shared memory frame ring. When non zero
+        frames are read directly into the ring and w_scene_frame_ready is
+        broadcast with slot index and frame size. Zero disables the ring.
+        """
+        if self.__frame_ring:
+            return self.__frame_ring.slots
+        return 0
+
+    @frame_ring_slots.setter
+    def frame_ring_slots(self, value):
+        if value != self.frame_ring_slots:
+            ring = self.__frame_ring
+            if value:
+                self.__frame_ring = FrameRing(value)
+                self.readback = FrameRingReadback(self.__frame_ring,
+                                                  self.__frame_ready)
+            else:
+                self.__frame_ring = None
+                self.readback = SyncReadback()
+            if ring:
+                ring.close()
+
+    def __frame_ready(self, index, size):
+        wizard.w_scene_frame_ready(self, index, size)
+
+    @property
+    def interactive_scale(self):
+        """
+        Scale of rendering resolution while mouse button is held or wheel is
+        spinning. Frames are upsampled to the window size for display and a
+        full resolution frame is rendered once interaction was idle for
+        still_delay milliseconds. 1.0 disables reduced resolution.
+        """
+        return self.__interactive_scale
+
+    @interactive_scale.setter
+    def interactive_scale(self, value):
+        if not 0 < value <= 1:
+            raise ValueError('Interactive scale must be in (0, 1]')
+        self.__interactive_scale = value
+
+    @property
+    def still_delay(self):
+        return self.__still_delay
+
+    @still_delay.setter
+    def still_delay(self, value):
+        self.__still_delay = value
+
+    @property
+    def camera_settle_delay(self):
+        """
+        Time in milliseconds the camera has to stay unchanged before
+        w_scene_camera_settled is broadcast.
+        """
+        return self.__camera_settle_delay
+
+    @camera_settle_delay.setter
+    def camera_settle_delay(self, value):
+        self.__camera_settle_delay = value
+
+    def __camera_changed(self, params):
+        self.__camera_params = params
+        waiting = self.__camera_time is not None
+        self.__camera_time = perf_counter()
+        if not waiting:
+            wizard.timeout(self.__check_camera_settled,
+                           self.__camera_settle_delay)
+
+    def __check_camera_settled(self):
+        if self.__camera_time is None:
+            return
+        idle = (perf_counter() - self.__camera_time) * 1000
+        if idle < self.__camera_settle_delay:
+            wizard.timeout(self.__check_camera_settled,
+                           int(self.__camera_settle_delay - idle) + 1)
+        else:
+            self.__camera_time = None
+            wizard.w_scene_camera_settled(self, **self.__camera_params)
+
+    def __set_render_scale(self, scale):
+        if scale != self.render_window.render_scale:
+            self.render_window.render_scale = scale
+            self.interactors[-1].set_size(*self.render_window.render_size())
+
+    def __interaction_started(self):
+        self.__interaction_time = perf_counter()
+        self.__set_render_scale(self.__interactive_scale)
+
+    def __interaction_stopped(self):
+        if self.__interaction_time is not None:
+            self.__interaction_time = perf_counter()
+            wizard.timeout(self.__check_still, self.__still_delay)
+
+    def __check_still(self):
+        if self.__buttons or self.__interaction_time is None:
+            return
+        idle = (perf_counter() - self.__interaction_time) * 1000
+        if idle < self.__still_delay:
+            wizard.timeout(self.__check_still, int(self.__still_delay - idle))
+        else:
+            self.__interaction_time = None
+            self.__set_render_scale(1.0)
+            self.render(False)
+
+    def __event_position(self, x, y):
+        scale = self.render_window.render_scale
+        return int(x * scale), int((self.__size_y - y) * scale)
+
     @property
     def animation(self):
         return self.__properties.animation
@@ -161,10 +604,10 @@ class VtkScene(View):
         self.__properties.animation = value
         
     def w_reset_camera_to_object(self, objs, scale = None):
-        if set(self.__objects) & set(objs):
+        if not self.__objects.keys().isdisjoint(objs):
             bbox = vtkBoundingBox()
             for o in objs:
-                bbox.AddBounds(o.get_bounds(self))
+                bbox.AddBounds(o.cached_bounds(self))
             bounds = [0]*6
             bbox.GetBounds(bounds)
             if scale is not None:
@@ -185,6 +628,22 @@ class VtkScene(View):
         self.interactors.pop().disable()
         self.interactors[-1].enable()
 
+    @diceSlot('QString', bool, name='startAreaSelection')
+    def start_area_selection(self, mode='box', cells=False):
+        """
+        Starts selection of objects inside a region drawn with the mouse.
+
+        :param mode: 'box' or 'lasso'.
+        :param cells: Select cells of the only selected object instead.
+        """
+        target = None
+        if cells:
+            if len(self.selection) != 1:
+                return
+            target = next(iter(self.selection))
+        if not isinstance(self.interactors[-1], AreaSelectInteractor):
+            self.push_interactor(AreaSelectInteractor(self, mode, target))
+
     @diceProperty('QString', name='sceneName')
     def scene_name(self):
         return self.__name
@@ -199,10 +658,16 @@ class VtkScene(View):
 
     @property
     def objects(self):
-        return self.__objects
+        return list(self.__objects)
 
     def delete(self):
         self.clear()
+        self.render_window.readback.release()
+        self.encoder = None
+        self.hover_probe = False
+        self.lod.shutdown()
+        self.frame_ring_slots = 0
+        self.render_backend = None
         wizard.unsubscribe(self)
         super().delete()
 
@@ -211,18 +676,135 @@ class VtkScene(View):
         Removes all geometry object from scene.
         """
         while self.__objects:
-            obj = self.__objects.pop()
+            obj, _ = self.__objects.popitem()
             obj.detach(self)
             self.__properties.remove_object(obj)
+        self.__object_bounds.clear()
+        self.__stale_bounds.clear()
+        self.__props_mtime = None
+        self.__bounds = None
         self.render()
         
     def w_property_changed(self, obj, name, value):
         if obj in self.__objects:
-            self.renderer.ResetCameraClippingRange()
+            self.__stale_bounds.add(obj)
             self.render(True)
 
+    def w_geometry_batch_changed(self, changes):
+        changed = self.__objects.keys() & changes.keys()
+        if changed:
+            self.__stale_bounds.update(changed)
+            self.render(True)
+
+    def w_animation_frame_changed(self, animation, frame):
+        self.invalidate_bounds()
+
+    def invalidate_bounds(self, objs=None):
+        """
+        Marks bounds of objects to be recomputed by the next bounds call.
+        Objects are marked automatically when added, when their properties
+        (visibility included) change and on animation frames. Changes made
+        directly to actors, mappers or sources have to be announced by
+        calling this.
+
+        :param objs: Iterable of scene objects, all objects by default.
+        """
+        if objs is None:
+            self.__stale_bounds.update(self.__objects)
+        else:
+            self.__stale_bounds.update(
+                v for v in objs if v in self.__objects)
+
+    def __visible_bounds(self, obj):
+        if not isinstance(obj, GeometryBase) or not obj.visible:
+            return None
+        bounds = obj.cached_bounds(self)
+        if not bounds or bounds[0] > bounds[1]:
+            return None
+        return tuple(bounds)
+
+    def bounds(self):
+        """
+        Returns bounds of visible geometry objects, None when there are
+        none. Bounds are kept between calls, only objects marked by
+        invalidate_bounds are measured again, so an unchanged scene costs
+        nothing.
+        """
+        stale, self.__stale_bounds = self.__stale_bounds, set()
+        grow = []
+        for obj in stale:
+            old = self.__object_bounds.pop(obj, None)
+            new = self.__visible_bounds(obj)
+            if new is not None:
+                self.__object_bounds[obj] = new
+            if old is not None and old != new:
+                # Aggregate may shrink, it is rebuilt below.
+                self.__bounds_dirty = True
+            elif new is not None:
+                grow.append(new)
+        if self.__bounds_dirty:
+            self.__bounds_dirty = False
+            self.__bounds = None
+            grow = self.__object_bounds.values()
+        if grow:
+            bbox = vtkBoundingBox()
+            if self.__bounds:
+                bbox.AddBounds(self.__bounds)
+            for v in grow:
+                bbox.AddBounds(v)
+            bounds = [0] * 6
+            bbox.GetBounds(bounds)
+            self.__bounds = bounds
+        return list(self.__bounds) if self.__bounds else None
+
+    def __update_foreign_props(self):
+        """
+        Collects props of the renderer no scene object owns, e.g. widget
+        representations and handles.
+        """
+        owned = set()
+        for obj in self.__objects:
+            owned.update(getattr(obj, 'get_actors', tuple)())
+        props = self.renderer.GetViewProps()
+        foreign = []
+        props.InitTraversal()
+        prop = props.GetNextProp()
+        while prop:
+            if prop not in owned:
+                foreign.append(prop)
+            prop = props.GetNextProp()
+        self.__foreign_props = foreign
+        self.__props_mtime = props.GetMTime()
+
+    def __has_foreign_props(self):
+        """
+        Returns True when the renderer shows props no scene object owns.
+        They are collected again only when objects are added or removed or
+        when widgets add or remove props themselves.
+        """
+        if self.renderer.GetViewProps().GetMTime() != self.__props_mtime:
+            self.__update_foreign_props()
+        return any(v.GetVisibility() for v in self.__foreign_props)
+
     def updated(self, size, data):
-        self.update(size[0], size[1], True, data)
+        """
+        Frame rendered event handler.
+
+        :param size: Frame size.
+        :param data: RGBA pixels, bytes or a memoryview which is valid only
+        during the call.
+        """
+        whole = True
+        if self.__tile_differ:
+            tiles = self.__tile_differ.diff(size, data)
+            if not tiles:
+                return
+            wizard.w_scene_frame_tiles(self, size, tiles)
+            whole = tiles[0][:4] == (0, 0, size[0], size[1])
+        if self.__encoder:
+            self.__encoder.submit(size, data)
+        if whole:
+            self.update(size[0], size[1], True, data)
 
     def size_changed(self, size_x, size_y):
         """
@@ -235,8 +817,8 @@ class VtkScene(View):
         size_y = max(1, size_y)
         self.__size_x = size_x
         self.__size_y = size_y
-        self.interactors[-1].set_size(size_x, size_y)
         self.render_window.SetSize(size_x, size_y)
+        self.interactors[-1].set_size(*self.render_window.render_size())
         # self.update_camera()
         self.render()
 
@@ -262,7 +844,10 @@ class VtkScene(View):
         :param modifiers: Keyboard modifiers, i.e. 'Alt', 'Control', 'Shift'.
         """
 
-        y = self.__size_y - y
+        self.__buttons.add(btn)
+        if self.__interactive_scale != 1.0:
+            self.__interaction_started()
+        x, y = self.__event_position(x, y)
         self.interactors[-1].mouse_press(btn, x, y, modifiers)
         # self.render(False)
 
@@ -276,8 +861,11 @@ class VtkScene(View):
         :param modifiers: Keyboard modifiers, i.e. 'Alt', 'Control', 'Shift'.
         """
 
-        y = self.__size_y - y
+        x, y = self.__event_position(x, y)
         self.interactors[-1].mouse_release(btn, x, y, modifiers)
+        self.__buttons.discard(btn)
+        if not self.__buttons:
+            self.__interaction_stopped()
         # self.render(False)
 
     def mouse_move(self, x, y, modifiers):
@@ -288,7 +876,7 @@ class VtkScene(View):
         :param y: Y coordinate of position mouse moved to.
         :param modifiers: Keyboard modifiers, i.e. 'Alt', 'Control', 'Shift'.
         """
-        y = self.__size_y - y
+        x, y = self.__event_position(x, y)
         self.interactors[-1].mouse_move(x, y, modifiers)
         # self.update_camera()
         # self.render(False, True)
@@ -304,8 +892,12 @@ class VtkScene(View):
         :param modifiers: Keyboard modifiers, i.e. 'Alt', 'Control', 'Shift'.
         """
 
-        y = self.__size_y - y
+        if self.__interactive_scale != 1.0:
+            self.__interaction_started()
+        x, y = self.__event_position(x, y)
         self.interactors[-1].wheel(delta_x, delta_y, x, y, modifiers)
+        if not self.__buttons:
+            self.__interaction_stopped()
         # self.update_camera()
         # self.render(False)
 
@@ -319,27 +911,40 @@ class VtkScene(View):
             self.__active = value
             if value and self.__render_deferred:
                 self.render(False)
+            elif not value and self.__scheduler.pending:
+                # Inactive scenes render nothing, the frame is rendered
+                # when the scene is activated again.
+                self.__scheduler.cancel()
 
-    def __deferred_render(self):
-        if self.__render_deferred:
-            self.render(False)
+    def __render_now(self):
+        if self.__active:
+            self.__render_deferred = False
+            stats = self.__frame_stats
+            if stats.enabled:
+                stats.begin()
+                self.__count_visible()
+            if self.__render_backend:
+                self.__render_backend.request(self)
+            else:
+                start = perf_counter()
+                self.update_camera()
+                self.lod.apply()
+                stats.add('camera', perf_counter() - start)
+                self.render_window.Render()
 
     def render(self, deferred=True):
         """
-        Starts scene rendering.
+        Starts scene rendering. Requests are coalesced and frame rate is
+        limited by the scene scheduler.
 
-        :param deferred: When True rendering wil be started next tick.
+        :param deferred: When True rendering is a background request which
+        is started on a later tick. Otherwise it is an interactive request
+        which is rendered right away unless the previous frame is too recent.
         """
 
-        if deferred:
-            if not self.__render_deferred:
-                self.__render_deferred = True
-                if self.__active:
-                    wizard.timeout(self.__deferred_render, 0)  # render next tick
-        elif self.__active:
-            self.__render_deferred = False
-            self.update_camera()
-            self.render_window.Render()
+        self.__render_deferred = True
+        if self.__active:
+            self.__scheduler.request(interactive=not deferred)
 
     def add_object(self, obj, reset_camera=True):
         """
@@ -347,16 +952,33 @@ class VtkScene(View):
 
         :param obj: Geometry object.
         """
-        if obj not in self.objects:
-            self.__objects.append(obj)
+        self.add_objects((obj,), reset_camera)
+
+    def add_objects(self, objs, reset_camera=True):
+        """
+        Adds geometry objects to scene with one properties model update and
+        one render.
+
+        :param objs: Iterable of geometry objects.
+        :return: List of objects which were not in scene before.
+        """
+        added = [v for v in dict.fromkeys(objs) if v not in self.__objects]
+        if not added:
+            return added
+        for obj in added:
+            self.__objects[obj] = None
+            self.__stale_bounds.add(obj)
             wizard.subscribe(self, obj)
             obj.attach(self)
-            self.__properties.add_object(obj)
+        self.__properties.add_objects(added)
+        for obj in added:
             wizard.w_scene_object_added(self, obj)
-            if reset_camera:
-                self.reset_camera()
-            else:
-                self.render()
+        self.__update_foreign_props()
+        if reset_camera:
+            self.reset_camera()
+        else:
+            self.render()
+        return added
 
     def remove_object(self, obj):
         """
@@ -364,14 +986,32 @@ class VtkScene(View):
 
         :param obj: Geometry object.
         """
-        if obj in self.objects:
-            self.__objects.remove(obj)
+        self.remove_objects((obj,))
+
+    def remove_objects(self, objs):
+        """
+        Removes geometry objects from scene with one render.
+
+        :param objs: Iterable of geometry objects.
+        :return: List of removed objects.
+        """
+        removed = [v for v in dict.fromkeys(objs) if v in self.__objects]
+        if not removed:
+            return removed
+        for obj in removed:
+            del self.__objects[obj]
+            self.__stale_bounds.discard(obj)
+            if self.__object_bounds.pop(obj, None) is not None:
+                self.__bounds_dirty = True
             self.selection.discard(obj)
             wizard.unsubscribe(self, obj)
             obj.detach(self)
-            self.__properties.remove_object(obj)
+        self.__properties.remove_objects(removed)
+        for obj in removed:
             wizard.w_scene_object_removed(self, obj)
-            self.render()
+        self.__update_foreign_props()
+        self.render()
+        return removed
 
     @diceSlot(name='resetCamera')
     def reset_camera(self):
@@ -381,12 +1021,26 @@ class VtkScene(View):
         along its initial view plane normal (i.e., vector defined from camera
         position to focal point) so that all of the actors can be seen.
         """
-        self.renderer.ResetCamera()
+        bounds = self.bounds()
+        if bounds:
+            self.renderer.ResetCamera(bounds)
+        else:
+            self.renderer.ResetCamera()
         # self.update_camera()
         self.render()
 
     def update_camera(self):
-        self.renderer.ResetCameraClippingRange()
+        bounds = self.bounds()
+        if bounds and not self.__has_foreign_props():
+            # Padding keeps widgets reaching out of objects unclipped.
+            pad = 0.05 * math.sqrt(sum(
+                (bounds[i + 1] - bounds[i]) ** 2 for i in range(0, 6, 2)))
+            for i in range(0, 6, 2):
+                bounds[i] -= pad
+                bounds[i + 1] += pad
+            self.renderer.ResetCameraClippingRange(bounds)
+        else:
+            self.renderer.ResetCameraClippingRange()
         camera = self.renderer.GetActiveCamera()
         clipping_range = camera.GetClippingRange()
         focal_point = camera.GetFocalPoint()
@@ -394,18 +1048,27 @@ class VtkScene(View):
         roll = camera.GetRoll()
         view = camera.GetViewUp()
 
+        state = (clipping_range, focal_point, position, view,
+                 camera.GetViewAngle(), camera.GetParallelProjection(),
+                 camera.GetParallelScale(), self.render_window.render_size())
+        if state == self.__camera_state:
+            self.overlay.ResetCameraClippingRange()
+            return
+        self.__camera_state = state
+
         overlay_cam = self.overlay.GetActiveCamera()
         overlay_cam.SetFocalPoint(focal_point)
         overlay_cam.SetPosition(position)
         overlay_cam.SetRoll(roll)
         self.overlay.ResetCameraClippingRange()
 
-        wizard.w_scene_camera_updated(self,
-                                      clipping_range=clipping_range,
-                                      focal_point=focal_point,
-                                      position=position,
-                                      view=view,
-                                      roll=roll)
+        params = dict(clipping_range=clipping_range,
+                      focal_point=focal_point,
+                      position=position,
+                      view=view,
+                      roll=roll)
+        wizard.w_scene_camera_updated(self, **params)
+        self.__camera_changed(params)
 
     def get_camera_params(self, camera=None):
         """
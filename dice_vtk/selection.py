@@ -0,0 +1,383 @@
+# Standard Python modules
+# =======================
+
+# External modules
+# ================
+import numpy as np
+from vtk import vtkActor2D
+from vtk import vtkCellArray
+from vtk import vtkCellCenters
+from vtk import vtkDoubleArray
+from vtk import vtkExtractSelection
+from vtk import vtkMatrix4x4
+from vtk import vtkPoints
+from vtk import vtkPolyData
+from vtk import vtkPolyDataMapper2D
+from vtk import vtkSelection
+from vtk import vtkSelectionNode
+from vtk.util.numpy_support import vtk_to_numpy
+
+# DICE modules
+# ============
+from dice_tools import wizard
+from dice_vtk.interactor import BasicInteractor
+from dice_vtk.picking import LocatorPicker
+
+
+class BoundsTree:
+    """
+    Bounding volume hierarchy over axis aligned boxes, built by median
+    splits along the longest axis.
+    """
+
+    leaf_size = 8
+
+    def __init__(self, bounds):
+        """
+        :param bounds: Array like of shape (n, 6) with VTK bounds
+        (xmin, xmax, ymin, ymax, zmin, zmax) of every box.
+        """
+        bounds = np.asarray(bounds, dtype=float).reshape(-1, 6)
+        self.__lo = bounds[:, 0::2]
+        self.__hi = bounds[:, 1::2]
+        self.__order = np.arange(len(bounds))
+        # Nodes are (lo, hi, first, count, left, right), leaves have no
+        # children and cover order[first:first + count].
+        self.__nodes = []
+        if len(bounds):
+            self.__build(0, len(bounds))
+
+    def __build(self, first, count):
+        index = len(self.__nodes)
+        items = self.__order[first:first + count]
+        lo = self.__lo[items].min(axis=0)
+        hi = self.__hi[items].max(axis=0)
+        self.__nodes.append([lo, hi, first, count, -1, -1])
+        if count > self.leaf_size:
+            centers = self.__lo[items] + self.__hi[items]
+            axis = np.argmax(hi - lo)
+            half = count // 2
+            split = np.argpartition(centers[:, axis], half)
+            self.__order[first:first + count] = items[split]
+            self.__nodes[index][4] = self.__build(first, half)
+            self.__nodes[index][5] = self.__build(first + half, count - half)
+        return index
+
+    def query(self, planes):
+        """
+        Finds boxes intersecting a convex volume.
+
+        :param planes: Array of shape (m, 4) with planes (a, b, c, d), points
+        inside satisfy a*x + b*y + c*z + d >= 0.
+        :return: Array of indices of boxes which intersect the volume or lie
+        inside of it.
+        """
+        if not self.__nodes:
+            return np.empty(0, dtype=int)
+        normals = planes[:, :3]
+        positive = normals >= 0
+        found = []
+        stack = [0]
+        while stack:
+            lo, hi, first, count, left, right = self.__nodes[stack.pop()]
+            # Box corners farthest along and against every plane normal.
+            far = np.where(positive, hi, lo)
+            if np.any(np.einsum('ij,ij->i', normals, far) + planes[:, 3] < 0):
+                continue
+            near = np.where(positive, lo, hi)
+            inside = np.all(
+                np.einsum('ij,ij->i', normals, near) + planes[:, 3] >= 0)
+            if inside or left < 0:
+                items = self.__order[first:first + count]
+                if not inside:
+                    items = items[self.__intersecting(items, planes)]
+                found.append(items)
+            else:
+                stack.extend((left, right))
+        if not found:
+            return np.empty(0, dtype=int)
+        return np.concatenate(found)
+
+    def __intersecting(self, items, planes):
+        normals = planes[:, :3]
+        far = np.where(normals[None] >= 0, self.__hi[items][:, None],
+                       self.__lo[items][:, None])
+        distance = np.einsum('kij,ij->ki', far, normals) + planes[:, 3]
+        return np.all(distance >= 0, axis=1)
+
+
+def inside_polygon(points, polygon):
+    """
+    Tests 2D points against a polygon with the even-odd rule.
+
+    :param points: Array of shape (n, 2).
+    :param polygon: Array of shape (m, 2) with polygon vertices.
+    :return: Boolean array of shape (n,).
+    """
+    x = points[:, 0][:, None]
+    y = points[:, 1][:, None]
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    crosses = (y0 > y) != (y1 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xs = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return np.count_nonzero(crosses & (x < xs), axis=1) % 2 == 1
+
+
+class AreaSelectInteractor(BasicInteractor):
+    """
+    Selects objects, or cells of one object, inside a screen region drawn
+    with the left mouse button as a box or a free hand lasso.
+
+    The interactor is pushed with VtkScene.push_interactor and pops itself
+    when the button is released or Escape is pressed. Objects are selected
+    through w_geometry_objects_select, the selection is extended while
+    Shift or Control is held. Cells are reported as
+    w_scene_cells_selected(scene, obj, cell_ids).
+    """
+
+    EscapeKey = 0x01000000
+
+    def __init__(self, scene, mode='box', target=None, **kwargs):
+        """
+        :param scene: VtkScene.
+        :param mode: 'box' or 'lasso'.
+        :param target: Geometry object to select cells of, objects are
+        selected when None.
+        """
+        super().__init__(**kwargs)
+        if mode not in ('box', 'lasso'):
+            raise ValueError('Unknown selection mode {}'.format(mode))
+        self.scene = scene
+        self.renderer = scene.renderer
+        self.overlay = scene.overlay
+        self.mode = mode
+        self.target = target
+        self.__path = []
+
+        self.__points = vtkPoints()
+        self.__lines = vtkCellArray()
+        band = vtkPolyData()
+        band.SetPoints(self.__points)
+        band.SetLines(self.__lines)
+        mapper = vtkPolyDataMapper2D()
+        mapper.SetInputData(band)
+        self.__band = band
+        self.__actor = vtkActor2D()
+        self.__actor.SetMapper(mapper)
+        self.__actor.GetProperty().SetColor(1.0, 1.0, 0.0)
+        self.__actor.GetProperty().SetLineWidth(1.5)
+
+    def enable(self):
+        self.__path = []
+        self.overlay.AddActor2D(self.__actor)
+
+    def disable(self):
+        self.overlay.RemoveActor2D(self.__actor)
+
+    def mouse_press(self, btn, x, y, modifiers):
+        if btn == self.LeftButton:
+            self.__path = [(x, y)]
+            self.__update_band()
+
+    def mouse_move(self, x, y, modifiers):
+        if not self.__path:
+            return
+        if self.mode == 'box':
+            self.__path[1:] = [(x, y)]
+        else:
+            self.__path.append((x, y))
+        self.__update_band()
+
+    def mouse_release(self, btn, x, y, modifiers):
+        if btn != self.LeftButton or not self.__path:
+            return
+        self.mouse_move(x, y, modifiers)
+        polygon = self.polygon()
+        self.__path = []
+        self.scene.pop_interactor()
+        self.scene.render(False)
+        if polygon is None:
+            return
+        extend = modifiers & (self.ShiftModifier | self.ControlModifier)
+        if self.target is None:
+            objects = self.select_objects(polygon)
+            wizard.w_geometry_objects_select(objects, True, not extend)
+        else:
+            cell_ids = self.select_cells(self.target, polygon)
+            wizard.w_scene_cells_selected(self.scene, self.target, cell_ids)
+
+    def key_press(self, key, x, y, modifiers):
+        if key == self.EscapeKey:
+            self.__path = []
+            self.scene.pop_interactor()
+            self.scene.render(False)
+
+    def polygon(self):
+        """
+        Returns region drawn so far as array of display points, None when
+        it has no area.
+        """
+        if len(self.__path) < 2:
+            return None
+        if self.mode == 'box':
+            (x0, y0), (x1, y1) = self.__path
+            polygon = np.array(((x0, y0), (x1, y0), (x1, y1), (x0, y1)),
+                               dtype=float)
+        else:
+            polygon = np.array(self.__path, dtype=float)
+        size = polygon.max(axis=0) - polygon.min(axis=0)
+        if len(polygon) < 3 or size[0] < 1 or size[1] < 1:
+            return None
+        return polygon
+
+    def __update_band(self):
+        path = self.__path
+        if self.mode == 'box' and len(path) == 2:
+            (x0, y0), (x1, y1) = path
+            path = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+        self.__points.Reset()
+        self.__lines.Reset()
+        for x, y in path:
+            self.__points.InsertNextPoint(x, y, 0)
+        if len(path) > 1:
+            self.__lines.InsertNextCell(len(path) + 1)
+            for i in range(len(path)):
+                self.__lines.InsertCellPoint(i)
+            self.__lines.InsertCellPoint(0)
+        self.__points.Modified()
+        self.__lines.Modified()
+        self.__band.Modified()
+        self.scene.render(False)
+
+    def frustum(self, polygon):
+        """
+        Returns world corners of the view frustum through the bounding
+        rectangle of polygon as array of shape (8, 3) in the order used by
+        vtkSelectionNode.FRUSTUM: for x0, x1 and y0, y1 the near then the far
+        corner.
+        """
+        (x0, y0), (x1, y1) = polygon.min(axis=0), polygon.max(axis=0)
+        corners = []
+        for x in (x0, x1):
+            for y in (y0, y1):
+                for z in (0.0, 1.0):
+                    self.renderer.SetDisplayPoint(x, y, z)
+                    self.renderer.DisplayToWorld()
+                    p = self.renderer.GetWorldPoint()
+                    w = p[3] or 1.0
+                    corners.append((p[0] / w, p[1] / w, p[2] / w))
+        return np.array(corners)
+
+    @staticmethod
+    def frustum_planes(corners):
+        """
+        Returns planes of a frustum with inward normals as array of shape
+        (6, 4), see BoundsTree.query.
+        """
+        center = corners.mean(axis=0)
+        faces = ((0, 2, 4), (1, 3, 5), (0, 1, 2), (4, 5, 6), (0, 1, 4),
+                 (2, 3, 6))
+        planes = []
+        for a, b, c in faces:
+            normal = np.cross(corners[b] - corners[a], corners[c] - corners[a])
+            length = np.linalg.norm(normal)
+            if length:
+                normal = normal / length
+            d = -np.dot(normal, corners[a])
+            if np.dot(normal, center) + d < 0:
+                normal, d = -normal, -d
+            planes.append((normal[0], normal[1], normal[2], d))
+        return np.array(planes)
+
+    def project(self, points):
+        """
+        Projects world points to display coordinates of the renderer.
+        """
+        camera = self.renderer.GetActiveCamera()
+        matrix = camera.GetCompositeProjectionTransformMatrix(
+            self.renderer.GetTiledAspectRatio(), -1, 1)
+        m = np.array([[matrix.GetElement(i, j) for j in range(4)]
+                      for i in range(4)])
+        h = np.c_[points, np.ones(len(points))].dot(m.T)
+        view = h[:, :2] / h[:, 3:4]
+        size = np.array(self.renderer.GetSize(), dtype=float)
+        origin = np.array(self.renderer.GetOrigin(), dtype=float)
+        return origin + (view + 1.0) * 0.5 * size
+
+    def select_objects(self, polygon):
+        """
+        Returns visible objects of the scene whose bounding box intersects
+        the region frustum and whose bounding box center projects inside
+        polygon.
+        """
+        objects = []
+        bounds = []
+        for obj in self.scene.objects:
+            if not getattr(obj, 'visible', False):
+                continue
+            if not obj.get_actors():
+                continue
+            b = obj.cached_bounds(self.scene)
+            if b[0] > b[1]:
+                continue
+            objects.append(obj)
+            bounds.append(b)
+        if not objects:
+            return []
+
+        bounds = np.array(bounds, dtype=float)
+        planes = self.frustum_planes(self.frustum(polygon))
+        candidates = BoundsTree(bounds).query(planes)
+        if not len(candidates):
+            return []
+        centers = (bounds[candidates, 0::2] + bounds[candidates, 1::2]) / 2
+        inside = inside_polygon(self.project(centers), polygon)
+        return [objects[i] for i in candidates[inside]]
+
+    def select_cells(self, obj, polygon):
+        """
+        Returns ids of cells of the first actor of obj inside the region.
+        """
+        actor = obj.get_actors()[0]
+        data = LocatorPicker.mapper(actor).GetInput()
+        if data is None or data.GetNumberOfCells() == 0:
+            return np.empty(0, dtype=int)
+
+        corners = self.frustum(polygon)
+        inverse = vtkMatrix4x4()
+        vtkMatrix4x4.Invert(actor.GetMatrix(), inverse)
+        frustum = vtkDoubleArray()
+        frustum.SetNumberOfComponents(4)
+        for p in corners:
+            frustum.InsertNextTuple(inverse.MultiplyPoint(tuple(p) + (1.0,)))
+
+        node = vtkSelectionNode()
+        node.SetContentType(vtkSelectionNode.FRUSTUM)
+        node.SetFieldType(vtkSelectionNode.CELL)
+        node.SetSelectionList(frustum)
+        selection = vtkSelection()
+        selection.AddNode(node)
+        extract = vtkExtractSelection()
+        extract.SetInputData(0, data)
+        extract.SetInputData(1, selection)
+        extract.Update()
+        output = extract.GetOutput()
+        ids = output.GetCellData().GetArray('vtkOriginalCellIds')
+        if ids is None or output.GetNumberOfCells() == 0:
+            return np.empty(0, dtype=int)
+        ids = vtk_to_numpy(ids).copy()
+        if self.mode == 'box':
+            return ids
+
+        centers = vtkCellCenters()
+        centers.SetInputData(output)
+        centers.Update()
+        points = vtk_to_numpy(centers.GetOutput().GetPoints().GetData())
+        h = np.c_[points, np.ones(len(points))]
+        matrix = actor.GetMatrix()
+        m = np.array([[matrix.GetElement(i, j) for j in range(4)]
+                      for i in range(4)])
+        h = h.dot(m.T)
+        points = h[:, :3] / h[:, 3:4]
+        return ids[inside_polygon(self.project(points), polygon)]
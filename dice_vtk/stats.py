@@ -0,0 +1,96 @@
+# Standard Python modules
+# =======================
+from collections import deque
+from time import perf_counter
+
+# External modules
+# ================
+
+# DICE modules
+# ============
+
+
+class FrameStats:
+    """
+    Rolling window of per-frame render statistics. Every frame is a dict with
+    'time' (perf_counter at frame start), phase durations in seconds
+    ('camera', 'render', 'readback', 'transfer') and counters ('actors',
+    'triangles'). Nothing is recorded while disabled.
+    """
+
+    phases = ('camera', 'render', 'readback', 'transfer')
+
+    def __init__(self, size=300):
+        self.enabled = False
+        self.__frames = deque(maxlen=size)
+        self.__current = None
+
+    def begin(self):
+        """
+        Starts a new frame record.
+        """
+        if self.enabled:
+            self.__current = dict(time=perf_counter())
+            self.__frames.append(self.__current)
+
+    def add(self, key, value):
+        """
+        Adds value to key of the current frame. Delivery of frames read back
+        asynchronously is added to the latest frame started.
+        """
+        if self.enabled and self.__current is not None:
+            self.__current[key] = self.__current.get(key, 0) + value
+
+    def get(self, key, default=0):
+        if self.__current is None:
+            return default
+        return self.__current.get(key, default)
+
+    def clear(self):
+        self.__frames.clear()
+        self.__current = None
+
+    def last(self, count=1):
+        """
+        Returns list of the last count frame records.
+        """
+        frames = list(self.__frames)
+        return frames[-count:] if count else []
+
+    def percentiles(self, key, percents=(50, 90, 99)):
+        """
+        Returns dict like {'p50': value} of percentiles of key over recorded
+        frames using the nearest rank method, None values when nothing was
+        recorded.
+        """
+        values = sorted(v[key] for v in self.__frames if key in v)
+        result = {}
+        for p in percents:
+            if values:
+                rank = max(0, min(len(values) - 1,
+                                  int(round(p / 100.0 * len(values))) - 1))
+                result['p{}'.format(p)] = values[rank]
+            else:
+                result['p{}'.format(p)] = None
+        return result
+
+    def fps(self):
+        """
+        Returns mean frame rate over recorded frames.
+        """
+        if len(self.__frames) < 2:
+            return 0.0
+        elapsed = self.__frames[-1]['time'] - self.__frames[0]['time']
+        if elapsed <= 0:
+            return 0.0
+        return (len(self.__frames) - 1) / elapsed
+
+    def summary(self):
+        """
+        Returns dict with frame count, fps, and percentiles of phases and
+        counters.
+        """
+        result = dict(frames=len(self.__frames), fps=self.fps())
+        for key in self.phases + ('actors', 'triangles'):
+            result[key] = self.percentiles(key)
+        return result
@@ -0,0 +1,77 @@
+# Standard Python modules
+# =======================
+import os
+
+# External modules
+# ================
+import numpy as np
+
+# DICE modules
+# ============
+
+
+# Record of one triangle in a binary STL file.
+STL_TRIANGLE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+    ])
+
+STL_HEADER_SIZE = 84
+
+
+def map_stl(path):
+    """
+    Memory maps triangle records of binary STL file.
+
+    :return: Read only numpy memmap of STL_TRIANGLE records.
+    :raise ValueError: When file is not a binary STL file, ASCII files have
+    to be read with VtkSTL.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.read(STL_HEADER_SIZE)
+    if len(header) < STL_HEADER_SIZE:
+        raise ValueError('{} is not a binary STL file'.format(path))
+    count = int.from_bytes(header[80:84], 'little')
+    # Some exporters start binary headers with 'solid' too, the size is
+    # the reliable test.
+    if size < STL_HEADER_SIZE + count * STL_TRIANGLE.itemsize:
+        raise ValueError('{} is not a binary STL file'.format(path))
+    if count == 0:
+        return np.zeros(0, STL_TRIANGLE)
+    return np.memmap(path, dtype=STL_TRIANGLE, mode='r',
+                     offset=STL_HEADER_SIZE, shape=(count,))
+
+
+def read_stl(path, chunk_size=1 << 20):
+    """
+    Reads triangle corners of binary STL file.
+
+    The file is mapped and vertex blocks are copied chunk by chunk straight
+    into the result, bounds are taken from every chunk while it is still in
+    cache, so each byte is read from disk once and no parsing happens.
+
+    :param path: Path to binary STL file.
+    :param chunk_size: Number of triangles copied at once.
+    :return: Tuple (corners, bounds), float32 array (n * 3, 3) of triangle
+    corners and (xmin, xmax, ymin, ymax, zmin, zmax).
+    """
+    triangles = map_stl(path)
+    count = len(triangles)
+    corners = np.empty((count * 3, 3), np.float32)
+    lo = np.full(3, np.inf, np.float32)
+    hi = np.full(3, -np.inf, np.float32)
+    vertices = triangles['vertices']
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        block = corners[start * 3:stop * 3]
+        block.reshape((-1, 3, 3))[...] = vertices[start:stop]
+        np.minimum(lo, block.min(axis=0), out=lo)
+        np.maximum(hi, block.max(axis=0), out=hi)
+    del vertices, triangles
+    if count == 0:
+        bounds = (0.0,) * 6
+    else:
+        bounds = tuple(float(v) for v in np.column_stack((lo, hi)).ravel())
+    return corners, bounds